@@ -0,0 +1,80 @@
+# benchmarks/bench_extract_slots.py
+"""Compare bulk vs per-cell slot table extraction.
+
+Point it at any page that shows the booking table - a live Hudle court view
+or a saved snapshot opened from disk:
+
+    python benchmarks/bench_extract_slots.py https://hudle.in/... --runs 5
+    python benchmarks/bench_extract_slots.py saved_court_page.html
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraper import setup_driver, read_slot_table, read_slot_table_per_cell, build_slots
+
+
+class RoundTripCounter:
+    """Counts WebDriver HTTP commands by wrapping the driver's command executor"""
+
+    def __init__(self, driver):
+        self.count = 0
+        executor = driver.command_executor
+        original = executor.execute
+
+        def counting_execute(*args, **kwargs):
+            self.count += 1
+            return original(*args, **kwargs)
+
+        executor.execute = counting_execute
+
+
+def measure(driver, counter, reader, runs):
+    timings = []
+    round_trips = 0
+    slots = []
+    for _ in range(runs):
+        counter.count = 0
+        started = time.perf_counter()
+        table = reader(driver)
+        slots = build_slots(table, 'benchmark', 'benchmark')
+        timings.append(time.perf_counter() - started)
+        round_trips = counter.count
+    return min(timings), sum(timings) / len(timings), round_trips, slots
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('page', help='URL or local HTML file showing the slot table')
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    page = args.page
+    if os.path.exists(page):
+        page = 'file://' + os.path.abspath(page)
+
+    driver = setup_driver()
+    try:
+        driver.get(page)
+        counter = RoundTripCounter(driver)
+
+        results = {}
+        for name, reader in (('per-cell', read_slot_table_per_cell), ('bulk', read_slot_table)):
+            results[name] = measure(driver, counter, reader, args.runs)
+
+        print(f"\n{'path':<10} {'round trips':>12} {'best (s)':>10} {'mean (s)':>10} {'slots':>7}")
+        for name, (best, mean, round_trips, slots) in results.items():
+            print(f"{name:<10} {round_trips:>12} {best:>10.3f} {mean:>10.3f} {len(slots):>7}")
+
+        strip = lambda slots: [{k: v for k, v in s.items() if k != 'scraped_at'} for s in slots]
+        same = strip(results['per-cell'][3]) == strip(results['bulk'][3])
+        print(f"\nIdentical slot output: {same}")
+    finally:
+        driver.quit()
+
+
+if __name__ == '__main__':
+    main()
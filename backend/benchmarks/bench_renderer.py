@@ -0,0 +1,102 @@
+# benchmarks/bench_renderer.py
+"""Render 10k post documents: per-view conversion loop + JSONRenderer vs BSONJSONRenderer.
+
+    python benchmarks/bench_renderer.py --posts 10000 --runs 5
+"""
+import argparse
+import copy
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from django.conf import settings
+
+settings.configure(REST_FRAMEWORK={'DEFAULT_RENDERER_CLASSES': ['rest_framework.renderers.JSONRenderer']})
+
+import django
+
+django.setup()
+
+from bson import ObjectId
+from rest_framework.renderers import JSONRenderer
+
+from core.renderers import BSONJSONRenderer, dumps, orjson
+
+
+def make_posts(count):
+    now = datetime.now()
+    venue_id = ObjectId()
+    return [
+        {
+            '_id': ObjectId(),
+            'venue_id': venue_id,
+            'title': f"Evening doubles #{i}",
+            'skill_level': 'Intermediate',
+            'game_datetime': now + timedelta(hours=i, microseconds=i),
+            'description': 'Friendly game, bring your own paddle. ' * 3,
+            'players_needed': 4,
+            'created_by': f"user_{i % 500}",
+            'created_by_name': 'Player Name',
+            'interested_count': i % 5,
+            'created_at': now - timedelta(days=1, microseconds=i),
+        }
+        for i in range(count)
+    ]
+
+
+def current_path(posts):
+    # What the views did before: convert every document, then JSONRenderer
+    for p in posts:
+        p['_id'] = str(p['_id'])
+        p['venue_id'] = str(p['venue_id'])
+        p['game_datetime'] = p['game_datetime'].isoformat()
+        p['created_at'] = p['created_at'].isoformat()
+    return JSONRenderer().render(posts)
+
+
+def bson_path(posts):
+    return BSONJSONRenderer().render(posts)
+
+
+def streamed_path(posts):
+    # Element-by-element encoding, as a streamed JSON array would send it
+    chunks = [b'[']
+    for i, post in enumerate(posts):
+        if i:
+            chunks.append(b',')
+        chunks.append(dumps(post))
+    chunks.append(b']')
+    return b''.join(chunks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--posts', type=int, default=10000)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    template = make_posts(args.posts)
+    print(f"{args.posts} posts, best of {args.runs} runs, orjson={'yes' if orjson else 'no'}")
+
+    outputs = {}
+    for name, render in (('loop + JSONRenderer', current_path),
+                         ('BSONJSONRenderer', bson_path),
+                         ('per-item dumps', streamed_path)):
+        timings = []
+        for _ in range(args.runs):
+            posts = copy.deepcopy(template)  # the old path mutates its input
+            started = time.perf_counter()
+            outputs[name] = render(posts)
+            timings.append(time.perf_counter() - started)
+        print(f"{name:<22} {min(timings) * 1000:>9.1f} ms  {len(outputs[name]) / 1024:>8.0f} KiB")
+
+    import json
+    decoded = {name: json.loads(body) for name, body in outputs.items()}
+    print(f"Same JSON content: {len({json.dumps(v, sort_keys=True) for v in decoded.values()}) == 1}")
+
+
+if __name__ == '__main__':
+    main()
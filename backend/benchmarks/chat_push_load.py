@@ -0,0 +1,183 @@
+# benchmarks/chat_push_load.py
+"""Load test: N idle chat clients under polling vs server-sent events.
+
+Run the backend under an ASGI server first, e.g.
+
+    uvicorn pickleball_backend.asgi:application --port 8000
+
+then, with a valid Clerk token for a test user:
+
+    python benchmarks/chat_push_load.py --token $TOKEN --other-user user_abc --clients 200 --duration 60
+
+Polling mode reproduces the frontend: each client GETs its conversation every
+3s (ChatWindow.js) and the conversation list every 10s (MyChats.js). Push mode
+keeps one SSE stream per client open and sends a message to the token's own
+user every --send-every seconds, so every stream should receive it.
+The report shows how many HTTP requests per second the server handled in each mode.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import datetime
+from urllib.parse import quote, urlsplit
+
+
+async def http_request(host, port, method, path, token, body=None):
+    """Minimal HTTP/1.1 client so the test needs nothing beyond the stdlib"""
+    reader, writer = await asyncio.open_connection(host, port)
+    payload = json.dumps(body).encode() if body is not None else b''
+    headers = [
+        f"{method} {path} HTTP/1.1",
+        f"Host: {host}:{port}",
+        f"Authorization: Bearer {token}",
+        "Connection: close",
+    ]
+    if body is not None:
+        headers += ["Content-Type: application/json", f"Content-Length: {len(payload)}"]
+    writer.write(("\r\n".join(headers) + "\r\n\r\n").encode() + payload)
+    await writer.drain()
+    status_line = await reader.readline()
+    await reader.read()
+    writer.close()
+    return int(status_line.split()[1])
+
+
+class Stats:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.latencies = []
+
+    def record(self, status, started):
+        self.requests += 1
+        self.latencies.append(time.perf_counter() - started)
+        if status >= 400:
+            self.errors += 1
+
+
+async def polling_client(args, host, port, stats, deadline, offset):
+    await asyncio.sleep(offset)  # spread clients over the poll interval
+    next_conversations = time.monotonic()
+    since = quote(datetime.now().isoformat())
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        try:
+            status = await http_request(host, port, 'GET', f"/api/messages/{args.other_user}/?since={since}", args.token)
+        except OSError:
+            status = 599
+        stats.record(status, started)
+
+        if time.monotonic() >= next_conversations:
+            started = time.perf_counter()
+            try:
+                status = await http_request(host, port, 'GET', '/api/conversations/', args.token)
+            except OSError:
+                status = 599
+            stats.record(status, started)
+            next_conversations += 10
+
+        await asyncio.sleep(3)
+
+
+async def run_polling(args, host, port):
+    stats = Stats()
+    deadline = time.monotonic() + args.duration
+    await asyncio.gather(*(
+        polling_client(args, host, port, stats, deadline, 3 * i / args.clients)
+        for i in range(args.clients)
+    ))
+    return stats, []
+
+
+async def sse_client(host, port, token, deadline, received, connected):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write((
+        f"GET /api/messages/stream/?token={quote(token)} HTTP/1.1\r\n"
+        f"Host: {host}:{port}\r\nAccept: text/event-stream\r\n\r\n"
+    ).encode())
+    await writer.drain()
+    connected.append(1)
+    try:
+        while time.monotonic() < deadline:
+            try:
+                line = await asyncio.wait_for(reader.readline(), deadline - time.monotonic())
+            except asyncio.TimeoutError:
+                break
+            if not line:
+                break
+            if line.startswith(b'data: '):
+                event = json.loads(line[6:])
+                sent_at = event.get('message', {}).get('message_encrypted', '')
+                if sent_at.startswith('loadtest:'):
+                    received.append(time.time() - float(sent_at.split(':', 1)[1]))
+    finally:
+        writer.close()
+
+
+async def run_push(args, host, port):
+    stats = Stats()
+    received, connected = [], []
+    deadline = time.monotonic() + args.duration
+    clients = [
+        asyncio.create_task(sse_client(host, port, args.token, deadline, received, connected))
+        for _ in range(args.clients)
+    ]
+    stats.requests += args.clients  # one request per stream for the whole run
+
+    async def sender():
+        await asyncio.sleep(2)
+        while time.monotonic() < deadline - args.send_every:
+            started = time.perf_counter()
+            # The body is opaque to the server; we smuggle the send time through it
+            status = await http_request(host, port, 'POST', '/api/messages/send/', args.token, {
+                'receiver_id': args.self_user,
+                'message': f"loadtest:{time.time()}",
+            })
+            stats.record(status, started)
+            await asyncio.sleep(args.send_every)
+
+    if args.self_user:
+        clients.append(asyncio.create_task(sender()))
+    await asyncio.gather(*clients, return_exceptions=True)
+    print(f"  streams connected: {len(connected)}/{args.clients}")
+    return stats, received
+
+
+def report(mode, stats, duration, deliveries):
+    rps = stats.requests / duration
+    line = f"{mode:<8} requests={stats.requests:<7} req/s={rps:<8.1f} errors={stats.errors}"
+    if stats.latencies:
+        line += f" p50={statistics.median(stats.latencies) * 1000:.0f}ms"
+    if deliveries:
+        line += f" pushed={len(deliveries)} delivery_p50={statistics.median(deliveries) * 1000:.0f}ms"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--token', required=True, help='Clerk JWT (template "backend")')
+    parser.add_argument('--other-user', required=True, help='conversation partner for polling')
+    parser.add_argument('--self-user', help="the token's own user id; enables test messages in push mode")
+    parser.add_argument('--clients', type=int, default=100)
+    parser.add_argument('--duration', type=int, default=30)
+    parser.add_argument('--send-every', type=float, default=5)
+    parser.add_argument('--mode', choices=['both', 'poll', 'push'], default='both')
+    args = parser.parse_args()
+
+    url = urlsplit(args.base_url)
+    host, port = url.hostname, url.port or 80
+
+    print(f"{args.clients} idle clients for {args.duration}s against {args.base_url}")
+    if args.mode in ('both', 'poll'):
+        stats, _ = asyncio.run(run_polling(args, host, port))
+        report('polling', stats, args.duration, [])
+    if args.mode in ('both', 'push'):
+        stats, deliveries = asyncio.run(run_push(args, host, port))
+        report('push', stats, args.duration, deliveries)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+# benchmarks/clerk_standin.py
+"""Exercise the Clerk outbound client against a local stand-in server.
+
+    python benchmarks/clerk_standin.py --calls 40
+
+Starts a stdlib HTTP server that answers /v1/me and /jwks.json, then makes
+calls through a client built like core.http_client.clerk_client while the
+stand-in is healthy, failing with 503, hung (sleeps past the read timeout)
+and healthy again, waiting out the breaker between phases. Each phase prints the number of calls, the outcomes and
+the worst latency. That shows the timeouts bounding hung calls, the breaker
+failing fast and a half-open trial closing it again. Keep-alive reuse is
+shown by the number of TCP connections the server accepted.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# core.metrics has no Django dependency; http_client only needs its config values
+os.environ.setdefault('CLERK_API_URL', 'http://127.0.0.1/v1')
+
+from core.http_client import CircuitBreaker, CircuitOpenError, OutboundClient  # noqa: E402
+
+
+class StandIn(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, like Clerk
+    mode = 'ok'
+    hang_seconds = 2.0
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+
+    def do_GET(self):
+        if self.mode == 'hang':
+            time.sleep(self.hang_seconds)
+        if self.mode == 'error':
+            self.reply(503, {'error': 'degraded'})
+        elif self.path.endswith('/jwks.json'):
+            self.reply(200, {'keys': [{'kid': 'stand-in', 'kty': 'RSA'}]})
+        else:
+            self.reply(200, {'id': 'user_standin'})
+
+    def reply(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        try:
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client already gave up on a hung call
+
+    def log_message(self, *args):
+        pass
+
+
+def run_phase(client, url, mode, calls):
+    StandIn.mode = mode
+    outcomes = {}
+    worst = 0.0
+    for _ in range(calls):
+        started = time.perf_counter()
+        try:
+            outcome = str(client.get(url).status_code)
+        except CircuitOpenError:
+            outcome = 'circuit_open'
+        except Exception as e:
+            outcome = type(e).__name__
+        worst = max(worst, time.perf_counter() - started)
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    print(f"{mode:<6} {calls:>4} calls  worst {worst * 1000:>7.0f} ms  "
+          f"breaker={client.breaker.state:<9} {outcomes}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=40)
+    parser.add_argument('--read-timeout', type=float, default=0.5)
+    parser.add_argument('--failures', type=int, default=5)
+    parser.add_argument('--reset-seconds', type=float, default=1.0)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/me"
+
+    client = OutboundClient(
+        'clerk-standin',
+        timeout=(1.0, args.read_timeout),
+        retries=1,
+        pool_size=4,
+        breaker=CircuitBreaker(args.failures, args.reset_seconds),
+    )
+
+    run_phase(client, url, 'ok', args.calls)
+    print(f"TCP connections for {args.calls} healthy calls: {StandIn.connections}")
+    run_phase(client, url, 'error', args.calls)
+    time.sleep(args.reset_seconds)
+    run_phase(client, url, 'hang', args.calls)
+    time.sleep(args.reset_seconds)
+    run_phase(client, url, 'ok', args.calls)
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+# benchmarks/replay_snapshots.py
+"""Offline parsing benchmark and replay harness for the slot scraper.
+
+    python benchmarks/replay_snapshots.py parse             # pages/sec of the pure-Python parser
+    python benchmarks/replay_snapshots.py replay            # serve fixtures to headless Chrome
+    python benchmarks/replay_snapshots.py capture <venue_url> --court 0 --out fixtures/hudle/x.html
+
+Snapshots live in fixtures/hudle/. `replay` serves them from a local HTTP
+server, runs extract_slots on each one in every extract mode and checks the
+results match the offline parse.
+"""
+import argparse
+import functools
+import glob
+import os
+import sys
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import scraper
+
+FIXTURE_DIR = os.path.join(BACKEND_DIR, 'fixtures', 'hudle')
+
+
+def _without_timestamps(slots):
+    return [{k: v for k, v in slot.items() if k != 'scraped_at'} for slot in slots]
+
+
+def _fixtures(pattern):
+    paths = sorted(glob.glob(os.path.join(FIXTURE_DIR, pattern)))
+    if not paths:
+        sys.exit(f"No fixtures matching {pattern} in {FIXTURE_DIR}")
+    return paths
+
+
+def bench_parse(args):
+    pages = [(os.path.basename(p), open(p, encoding='utf-8').read()) for p in _fixtures(args.pattern)]
+
+    started = time.perf_counter()
+    slot_count = 0
+    for _ in range(args.runs):
+        for name, html in pages:
+            slot_count += len(scraper.parse_slot_page(html, 'benchmark', name))
+    elapsed = time.perf_counter() - started
+
+    parsed = args.runs * len(pages)
+    print(f"Parsed {parsed} pages ({slot_count} slots) in {elapsed:.3f}s")
+    print(f"{parsed / elapsed:.1f} pages/sec, {elapsed / parsed * 1000:.2f} ms/page")
+
+
+def _serve_fixtures():
+    handler = functools.partial(SimpleHTTPRequestHandler, directory=FIXTURE_DIR)
+    handler.log_message = lambda *a: None
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def replay(args):
+    server = _serve_fixtures()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    driver = scraper.setup_driver()
+    failures = 0
+    try:
+        for path in _fixtures(args.pattern):
+            name = os.path.basename(path)
+            expected = _without_timestamps(
+                scraper.parse_slot_page(open(path, encoding='utf-8').read(), 'replay', name)
+            )
+            driver.get(f"{base_url}/{name}")
+
+            for mode in ('script', 'page_source', 'per_cell'):
+                started = time.perf_counter()
+                slots = scraper.extract_slots(driver, 'replay', name, mode=mode)
+                elapsed = time.perf_counter() - started
+                same = _without_timestamps(slots) == expected
+                failures += not same
+                print(f"{name:<40} {mode:<12} {len(slots):>5} slots {elapsed:>8.3f}s  "
+                      f"{'match' if same else 'MISMATCH'}")
+    finally:
+        driver.quit()
+        server.shutdown()
+
+    sys.exit(1 if failures else 0)
+
+
+def capture(args):
+    """Save the rendered court view of a live venue as a new fixture"""
+    driver = scraper.setup_driver()
+    try:
+        court_buttons = scraper.open_court_selection(driver, args.venue_url)
+        court_button = court_buttons[args.court]
+        url_before = driver.current_url
+        court_button.click()
+        scraper.wait_for_navigation(driver, court_button, url_before, 'court_view')
+        scraper.wait_for(driver, 'table', scraper.slot_table_has_rows)
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(driver.page_source)
+        print(f"Saved {args.out}")
+    finally:
+        driver.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    parse_cmd = commands.add_parser('parse', help='benchmark the offline parser')
+    parse_cmd.add_argument('--runs', type=int, default=200)
+    parse_cmd.add_argument('--pattern', default='*.html')
+    parse_cmd.set_defaults(func=bench_parse)
+
+    replay_cmd = commands.add_parser('replay', help='replay fixtures through headless Chrome')
+    replay_cmd.add_argument('--pattern', default='*.html')
+    replay_cmd.set_defaults(func=replay)
+
+    capture_cmd = commands.add_parser('capture', help='capture a live court view as a fixture')
+    capture_cmd.add_argument('venue_url')
+    capture_cmd.add_argument('--court', type=int, default=0)
+    capture_cmd.add_argument('--out', required=True)
+    capture_cmd.set_defaults(func=capture)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,31 @@
+import logging
+import threading
+
 from django.apps import AppConfig
 
+logger = logging.getLogger(__name__)
+
 
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core"
+
+    def ready(self):
+        from .indexes import MONGO_ENSURE_INDEXES_ON_STARTUP
+
+        if MONGO_ENSURE_INDEXES_ON_STARTUP:
+            # Off the main thread so a slow or unreachable cluster never delays startup
+            threading.Thread(target=_ensure_indexes_quietly, name='ensure-indexes', daemon=True).start()
+
+
+def _ensure_indexes_quietly():
+    from .indexes import ensure_indexes
+    from .mongo_connection import mongo_db
+
+    try:
+        _, failed = ensure_indexes(mongo_db)
+    except Exception as e:
+        logger.warning("Could not ensure Mongo indexes: %s", e)
+        return
+    for collection, error in failed.items():
+        logger.warning("Could not ensure %s indexes (run manage.py ensure_indexes): %s", collection, error)
@@ -0,0 +1,119 @@
+# backend/core/async_views.py
+"""Async versions of the high-traffic read endpoints.
+
+Same parameters and responses as their namesakes in core.views, but Mongo is
+awaited on the shared AsyncMongoClient, so a request waiting on the database
+does not hold a worker thread. Routed instead of the sync views when
+ASYNC_READ_VIEWS is on, which pickleball_backend/asgi.py does by default.
+"""
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+
+from .conversations import mark_read_async
+from .mongo_connection import get_async_mongo_db
+from .renderers import dumps
+from .venue_cache import venue_cache
+from .views import (
+    INTERESTED_USERS,
+    NAME_PROJECTION,
+    as_json_response,
+    conversation_rows,
+    display_name,
+    get_authenticated_user_async,
+    has_incoming,
+    not_modified,
+    other_participant,
+    parse_conversation_request,
+    parse_posts_request,
+    posts_page,
+    prepare_messages,
+)
+
+
+def json_response(data, status=200, headers=None):
+    return HttpResponse(dumps(data), status=status, headers=headers, content_type='application/json')
+
+
+@require_GET
+async def list_posts(request):
+    parsed, error = parse_posts_request(request.GET)
+    if error:
+        return as_json_response(error)
+    query, projection, limit = parsed
+
+    # The list is public; a valid token only adds the caller's own interest flag
+    if request.headers.get('Authorization'):
+        user_data, error = await get_authenticated_user_async(request)
+        if not error:
+            projection['is_interested'] = {'$in': [user_data['user_id'], INTERESTED_USERS]}
+
+    db = get_async_mongo_db()
+    posts = await (
+        db['posts'].find(query, projection)
+        .sort([('game_datetime', 1), ('_id', 1)])
+        .limit(limit + 1)
+        .to_list()
+    )
+
+    return json_response(posts_page(posts, limit))
+
+
+@require_GET
+async def get_conversation(request, other_user_id):
+    user_data, error = await get_authenticated_user_async(request)
+    if error:
+        return as_json_response(error)
+
+    current_user_id = user_data['user_id']
+    parsed, error = parse_conversation_request(request.GET, current_user_id, other_user_id)
+    if error:
+        return as_json_response(error)
+    query, projection, sort, limit = parsed
+
+    db = get_async_mongo_db()
+    cursor = db['messages'].find(query, projection).sort('timestamp', sort)
+    if limit is not None:
+        cursor = cursor.limit(limit)
+    messages = await cursor.to_list()
+    if sort < 0:
+        messages.reverse()
+
+    other_user_name = None
+    if has_incoming(messages, current_user_id):
+        other_user_name = display_name(await db['profiles'].find_one(
+            {'clerk_user_id': other_user_id}, NAME_PROJECTION
+        ))
+        await mark_read_async(db, current_user_id, other_user_id)
+
+    return json_response(prepare_messages(messages, current_user_id, other_user_name))
+
+
+@require_GET
+async def get_conversations(request):
+    user_data, error = await get_authenticated_user_async(request)
+    if error:
+        return as_json_response(error)
+
+    current_user_id = user_data['user_id']
+    db = get_async_mongo_db()
+    summaries = await db['conversations'].find(
+        {'participants': current_user_id}
+    ).sort('last_message_time', -1).to_list()
+
+    names = {}
+    other_user_ids = [other_participant(summary, current_user_id) for summary in summaries]
+    if other_user_ids:
+        profiles = await db['profiles'].find(
+            {'clerk_user_id': {'$in': other_user_ids}}, NAME_PROJECTION
+        ).to_list()
+        names = {profile['clerk_user_id']: display_name(profile) for profile in profiles}
+
+    return json_response(conversation_rows(summaries, current_user_id, names))
+
+
+@require_GET
+async def venue_list(request):
+    venues, etag = await venue_cache.all_async(get_async_mongo_db()['venues'])
+    if not_modified(request, etag):
+        return HttpResponse(status=304, headers={'ETag': etag})
+    return json_response(venues, headers={'ETag': etag})
@@ -0,0 +1,100 @@
+# backend/core/conversations.py
+from pymongo import ReplaceOne
+
+
+def conversation_key(user_a, user_b):
+    """Stable id for the conversation between two users, independent of who sent first"""
+    return '|'.join(sorted((user_a, user_b)))
+
+
+def record_message(mongo_db, sender_id, receiver_id, timestamp):
+    """Fold a newly sent message into the pair's summary in one atomic upsert"""
+    update = {
+        '$set': {
+            'participants': sorted({sender_id, receiver_id}),
+            'last_sender_id': sender_id,
+        },
+        '$max': {'last_message_time': timestamp},
+        '$inc': {f'unread.{receiver_id}': 1},
+    }
+    if sender_id != receiver_id:
+        update['$setOnInsert'] = {f'unread.{sender_id}': 0}
+
+    mongo_db['conversations'].update_one(
+        {'_id': conversation_key(sender_id, receiver_id)},
+        update,
+        upsert=True
+    )
+
+
+def _mark_read_update(user_id, other_user_id):
+    return (
+        {'_id': conversation_key(user_id, other_user_id), f'unread.{user_id}': {'$gt': 0}},
+        {'$set': {f'unread.{user_id}': 0}},
+    )
+
+
+def _read_messages_update(user_id, other_user_id):
+    return (
+        {'sender_id': other_user_id, 'receiver_id': user_id, 'read': False},
+        {'$set': {'read': True}},
+    )
+
+
+def mark_read(mongo_db, user_id, other_user_id):
+    """Reset the user's unread counter for this conversation and flag the messages read.
+
+    The flags are what rebuild_summaries counts; they are only touched when
+    the counter says something was unread, so repeat polls stay a single write.
+    """
+    result = mongo_db['conversations'].update_one(*_mark_read_update(user_id, other_user_id))
+    if result.modified_count:
+        mongo_db['messages'].update_many(*_read_messages_update(user_id, other_user_id))
+
+
+async def mark_read_async(async_db, user_id, other_user_id):
+    """mark_read on the async client"""
+    result = await async_db['conversations'].update_one(*_mark_read_update(user_id, other_user_id))
+    if result.modified_count:
+        await async_db['messages'].update_many(*_read_messages_update(user_id, other_user_id))
+
+
+def mark_all_read(mongo_db):
+    """One-off backfill: flag every message read, for data written before mark_read kept the flags"""
+    return mongo_db['messages'].update_many({'read': {'$ne': True}}, {'$set': {'read': True}}).modified_count
+
+
+def rebuild_summaries(mongo_db, batch_size=1000):
+    """Recompute every conversation summary from the messages collection.
+
+    Unread counts are taken from the messages' `read` flag, which mark_read
+    maintains. Messages stored before that have read=False whether or not they
+    were seen; run mark_all_read() once for them. Returns the number of
+    conversations written.
+    """
+    summaries = {}
+    cursor = mongo_db['messages'].find(
+        {},
+        {'_id': 0, 'sender_id': 1, 'receiver_id': 1, 'timestamp': 1, 'read': 1}
+    ).sort('timestamp', 1)
+
+    for msg in cursor:
+        sender_id, receiver_id = msg['sender_id'], msg['receiver_id']
+        key = conversation_key(sender_id, receiver_id)
+        summary = summaries.get(key)
+        if summary is None:
+            participants = sorted({sender_id, receiver_id})
+            summary = summaries[key] = {
+                '_id': key,
+                'participants': participants,
+                'unread': {user_id: 0 for user_id in participants},
+            }
+        summary['last_message_time'] = msg['timestamp']
+        summary['last_sender_id'] = sender_id
+        if not msg.get('read', False):
+            summary['unread'][receiver_id] += 1
+
+    requests = [ReplaceOne({'_id': key}, summary, upsert=True) for key, summary in summaries.items()]
+    for start in range(0, len(requests), batch_size):
+        mongo_db['conversations'].bulk_write(requests[start:start + batch_size], ordered=False)
+    return len(requests)
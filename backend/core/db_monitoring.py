@@ -0,0 +1,114 @@
+# backend/core/db_monitoring.py
+import contextvars
+import json
+from collections import Counter
+
+from decouple import config
+from pymongo import monitoring
+
+# Attach the command listener to the Mongo clients
+MONGO_QUERY_MONITORING = config('MONGO_QUERY_MONITORING', default=True, cast=bool)
+# A request running the same query shape more than this many times is reported as N+1
+MONGO_N_PLUS_ONE_THRESHOLD = config('MONGO_N_PLUS_ONE_THRESHOLD', default=5, cast=int)
+
+# Commands that are driver housekeeping rather than queries issued by our code
+IGNORED_COMMANDS = {'hello', 'ismaster', 'isMaster', 'ping', 'endSessions', 'saslStart', 'saslContinue', 'getMore'}
+
+
+def _shape(value):
+    """Replace every value in a filter with '?' so queries differing only in values compare equal"""
+    if isinstance(value, dict):
+        return {key: _shape(inner) for key, inner in sorted(value.items())}
+    if isinstance(value, list) and value and all(isinstance(item, dict) for item in value):
+        return [_shape(item) for item in value]
+    return '?'
+
+
+def query_shape(command_name, command):
+    """e.g. "find posts {"venue_id": "?"}" - the command, its collection and its filter's structure"""
+    collection = command.get(command_name)
+    if command_name == 'find':
+        criteria = command.get('filter', {})
+    elif command_name in ('update', 'delete'):
+        statements = command.get('updates' if command_name == 'update' else 'deletes') or [{}]
+        criteria = statements[0].get('q', {})
+    elif command_name == 'findAndModify':
+        criteria = command.get('query', {})
+    elif command_name == 'aggregate':
+        pipeline = command.get('pipeline') or [{}]
+        criteria = pipeline[0].get('$match', {})
+    elif command_name in ('count', 'distinct'):
+        criteria = command.get('query', {})
+    else:
+        criteria = {}
+    return f"{command_name} {collection} {json.dumps(_shape(criteria), sort_keys=True)}"
+
+
+class RequestQueryStats:
+    """Mongo commands issued while serving one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.by_collection = Counter()
+        self.shapes = Counter()
+        self._pending = {}
+
+    def started(self, event):
+        self._pending[event.request_id] = event.command_name
+
+    def finished(self, event):
+        if self._pending.pop(event.request_id, None) is None:
+            return
+        self.count += 1
+        self.total_ms += event.duration_micros / 1000
+
+    def repeated_shapes(self, threshold=MONGO_N_PLUS_ONE_THRESHOLD):
+        """[(shape, times)] for shapes run more than `threshold` times"""
+        return [(shape, times) for shape, times in self.shapes.most_common() if times > threshold]
+
+
+# Stats of the request being served in this thread/task; None outside a request
+_current_stats = contextvars.ContextVar('mongo_request_stats', default=None)
+
+
+def start_request():
+    """Begin collecting for the current request; returns (stats, token for finish_request)"""
+    stats = RequestQueryStats()
+    return stats, _current_stats.set(stats)
+
+
+def finish_request(token):
+    _current_stats.reset(token)
+
+
+class RequestCommandListener(monitoring.CommandListener):
+    """Attributes each command to the Django request that issued it.
+
+    pymongo calls listeners in the thread (or task) running the command, so the
+    context variable set by the middleware identifies the request. Commands from
+    background threads are ignored.
+    """
+
+    def started(self, event):
+        stats = _current_stats.get()
+        if stats is None or event.command_name in IGNORED_COMMANDS:
+            return
+        stats.started(event)
+        stats.by_collection[event.command.get(event.command_name)] += 1
+        stats.shapes[query_shape(event.command_name, event.command)] += 1
+
+    def succeeded(self, event):
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.finished(event)
+
+    def failed(self, event):
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.finished(event)
+
+
+def event_listeners():
+    """Listeners to pass to MongoClient / AsyncMongoClient"""
+    return [RequestCommandListener()] if MONGO_QUERY_MONITORING else []
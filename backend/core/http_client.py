@@ -0,0 +1,158 @@
+# backend/core/http_client.py
+import logging
+import threading
+import time
+
+import requests
+from decouple import config
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .metrics import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+# Clerk API base URL; point it at a local stand-in server to test outages
+CLERK_API_URL = config('CLERK_API_URL', default='https://api.clerk.com/v1')
+# Seconds to establish a connection / to wait for response bytes
+CLERK_CONNECT_TIMEOUT = config('CLERK_CONNECT_TIMEOUT', default=3, cast=float)
+CLERK_READ_TIMEOUT = config('CLERK_READ_TIMEOUT', default=5, cast=float)
+# Retries on connection errors and 502/503/504, with exponential backoff. Read timeouts are
+# never retried: a hung Clerk would hold the auth request for another read timeout each time
+CLERK_HTTP_RETRIES = config('CLERK_HTTP_RETRIES', default=2, cast=int)
+# Keep-alive connections kept per host
+CLERK_HTTP_POOL_SIZE = config('CLERK_HTTP_POOL_SIZE', default=10, cast=int)
+# Consecutive failed calls that open the breaker, and how long it stays open
+CLERK_BREAKER_FAILURES = config('CLERK_BREAKER_FAILURES', default=5, cast=int)
+CLERK_BREAKER_RESET_SECONDS = config('CLERK_BREAKER_RESET_SECONDS', default=30, cast=float)
+
+OUTBOUND_REQUESTS = Counter(
+    'picklepick_outbound_requests_total', 'Outbound HTTP calls by client and outcome',
+    ['client', 'outcome'],
+)
+CIRCUIT_OPEN = Gauge(
+    'picklepick_outbound_circuit_open', '1 while the client is failing fast',
+    ['client'],
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency that recently kept failing"""
+
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures.
+
+    While open, calls fail immediately. After `reset_timeout` seconds one
+    trial call is let through (half-open): success closes the breaker,
+    failure opens it for another period.
+    """
+
+    def __init__(self, failure_threshold, reset_timeout, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self._opened_at is None:
+            return 'closed'
+        if self.clock() - self._opened_at >= self.reset_timeout:
+            return 'half_open'
+        return 'open'
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half_open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        """Returns True when this failure opened (or re-opened) the breaker"""
+        with self._lock:
+            self._failures += 1
+            reopen = self._trial_in_flight or (self._opened_at is None and self._failures >= self.failure_threshold)
+            self._trial_in_flight = False
+            if reopen:
+                self._opened_at = self.clock()
+            return reopen
+
+
+class OutboundClient:
+    """A pooled requests.Session with default timeouts, bounded retries and a circuit breaker.
+
+    Safe to share between threads. Responses with status >= 500, timeouts and
+    connection errors count as failures; 4xx answers mean the dependency is up.
+    Only failures that happen before the request is read are retried, so a hung
+    endpoint costs one read timeout per call, not one per attempt.
+    """
+
+    def __init__(self, name, timeout, retries, pool_size, breaker):
+        self.name = name
+        self.timeout = timeout
+        self.breaker = breaker
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=0,
+            status=retries,
+            backoff_factor=0.2,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({'GET'}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def get(self, url, **kwargs):
+        """session.get with the client's timeout; raises CircuitOpenError while failing fast"""
+        if not self.breaker.allow():
+            OUTBOUND_REQUESTS.inc(client=self.name, outcome='circuit_open')
+            raise CircuitOpenError(f"{self.name} circuit is open")
+
+        kwargs.setdefault('timeout', self.timeout)
+        try:
+            response = self.session.get(url, **kwargs)
+        except Exception:
+            self._failed('error')
+            raise
+
+        if response.status_code >= 500:
+            self._failed('server_error')
+        else:
+            OUTBOUND_REQUESTS.inc(client=self.name, outcome='ok')
+            self.breaker.record_success()
+            CIRCUIT_OPEN.set(0, client=self.name)
+        return response
+
+    def _failed(self, outcome):
+        OUTBOUND_REQUESTS.inc(client=self.name, outcome=outcome)
+        if self.breaker.record_failure():
+            CIRCUIT_OPEN.set(1, client=self.name)
+            logger.warning("%s circuit opened for %ss", self.name, self.breaker.reset_timeout)
+
+
+clerk_client = OutboundClient(
+    'clerk',
+    timeout=(CLERK_CONNECT_TIMEOUT, CLERK_READ_TIMEOUT),
+    retries=CLERK_HTTP_RETRIES,
+    pool_size=CLERK_HTTP_POOL_SIZE,
+    breaker=CircuitBreaker(CLERK_BREAKER_FAILURES, CLERK_BREAKER_RESET_SECONDS),
+)
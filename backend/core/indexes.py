@@ -0,0 +1,170 @@
+# backend/core/indexes.py
+from datetime import datetime
+
+from bson import ObjectId
+from decouple import config
+from pymongo import ASCENDING, DESCENDING, DeleteMany, IndexModel
+from pymongo.errors import PyMongoError
+
+from .slot_cache import SLOT_CACHE_STALE_SECONDS
+
+# Build indexes in a background thread when the app starts
+MONGO_ENSURE_INDEXES_ON_STARTUP = config('MONGO_ENSURE_INDEXES_ON_STARTUP', default=True, cast=bool)
+
+# Every index the API's query shapes rely on, per collection
+INDEXES = {
+    'profiles': [
+        IndexModel([('clerk_user_id', ASCENDING)], unique=True),
+    ],
+    'posts': [
+        # list_posts: venue_id equality + (game_datetime, _id) keyset sort
+        IndexModel([('venue_id', ASCENDING), ('game_datetime', ASCENDING), ('_id', ASCENDING)]),
+        # get_my_posts
+        IndexModel([('created_by', ASCENDING)]),
+    ],
+    'messages': [
+        # get_conversation: both $or branches are sender+receiver equality sorted by time
+        IndexModel([('sender_id', ASCENDING), ('receiver_id', ASCENDING), ('timestamp', ASCENDING)]),
+    ],
+    'conversations': [
+        IndexModel([('participants', ASCENDING), ('last_message_time', DESCENDING)]),
+    ],
+    'venues': [
+        # import_venues upserts by hudle_url; older hand-inserted venues may have it blank
+        IndexModel([('hudle_url', ASCENDING)], unique=True,
+                   partialFilterExpression={'hudle_url': {'$type': 'string', '$gt': ''}}),
+    ],
+    'slot_cache': [
+        IndexModel([('venue_url', ASCENDING)], unique=True),
+        IndexModel([('stored_at', ASCENDING)], expireAfterSeconds=SLOT_CACHE_STALE_SECONDS),
+    ],
+}
+
+
+# Indexes we used to create and no query needs any more; dropped by ensure_indexes
+OBSOLETE_INDEXES = {
+    # Conversation lists are read from the conversations collection since summaries were added
+    'messages': ['receiver_id_1_timestamp_-1'],
+}
+
+
+def _sync_ttls(collection, models):
+    """Apply a changed expireAfterSeconds with collMod; create_indexes refuses to change it"""
+    existing = {tuple(info['key']): info for info in collection.index_information().values()}
+    for model in models:
+        spec = model.document
+        if 'expireAfterSeconds' not in spec:
+            continue
+        current = existing.get(tuple(spec['key'].items()))
+        if current is not None and current.get('expireAfterSeconds') != spec['expireAfterSeconds']:
+            collection.database.command('collMod', collection.name, index={
+                'keyPattern': spec['key'],
+                'expireAfterSeconds': spec['expireAfterSeconds'],
+            })
+
+
+def _drop_obsolete(collection):
+    existing = collection.index_information()
+    dropped = []
+    for name in OBSOLETE_INDEXES.get(collection.name, []):
+        if name in existing:
+            collection.drop_index(name)
+            dropped.append(name)
+    return dropped
+
+
+def ensure_indexes(mongo_db):
+    """Create any missing index, collection by collection. Safe to run repeatedly.
+
+    A failure on one collection (duplicate keys under a unique index, an
+    unreachable cluster) doesn't stop the others. Returns (created, failed):
+    {collection: [index names]} and {collection: error message}.
+    """
+    created, failed = {}, {}
+    for name, models in INDEXES.items():
+        collection = mongo_db[name]
+        try:
+            _sync_ttls(collection, models)
+            created[name] = collection.create_indexes(models)
+            _drop_obsolete(collection)
+        except PyMongoError as e:
+            failed[name] = str(e)
+    return created, failed
+
+
+def find_duplicates(collection, field, limit=None):
+    """[(value, [_id, ...])] for non-empty values of `field` held by more than one document, oldest _id first"""
+    pipeline = [
+        {'$match': {field: {'$type': 'string', '$gt': ''}}},
+        {'$sort': {'_id': 1}},
+        {'$group': {'_id': f'${field}', 'ids': {'$push': '$_id'}, 'count': {'$sum': 1}}},
+        {'$match': {'count': {'$gt': 1}}},
+    ]
+    if limit:
+        pipeline.append({'$limit': limit})
+    return [(group['_id'], group['ids']) for group in collection.aggregate(pipeline, allowDiskUse=True)]
+
+
+def dedupe_profiles(mongo_db):
+    """Delete all but the oldest profile of each clerk_user_id so the unique index can build.
+
+    The oldest one is the profile find_one() and update_profile already used.
+    Returns the number of profiles deleted.
+    """
+    requests = [
+        DeleteMany({'_id': {'$in': ids[1:]}})
+        for _, ids in find_duplicates(mongo_db['profiles'], 'clerk_user_id')
+    ]
+    if not requests:
+        return 0
+    return mongo_db['profiles'].bulk_write(requests, ordered=False).deleted_count
+
+
+def query_shapes():
+    """Representative filters/sorts for the queries issued by core.views, with sample values"""
+    user_a, user_b = 'user_sample_a', 'user_sample_b'
+    now = datetime.now()
+    return [
+        ('profile by clerk id', 'profiles', {'clerk_user_id': user_a}, None),
+        ('profiles by $in', 'profiles', {'clerk_user_id': {'$in': [user_a, user_b]}}, None),
+        ('upcoming posts for venue', 'posts',
+         {'venue_id': ObjectId(), 'game_datetime': {'$gte': now}}, [('game_datetime', 1), ('_id', 1)]),
+        ('posts by creator', 'posts', {'created_by': user_a}, None),
+        ('conversation history', 'messages', {
+            '$or': [
+                {'sender_id': user_a, 'receiver_id': user_b},
+                {'sender_id': user_b, 'receiver_id': user_a},
+            ],
+            'timestamp': {'$gt': now},
+        }, [('timestamp', 1)]),
+        ('conversation summaries', 'conversations', {'participants': user_a}, [('last_message_time', -1)]),
+        ('venue by hudle url', 'venues', {'hudle_url': 'https://hudle.in/venues/sample/1'}, None),
+        ('cached slots', 'slot_cache', {'venue_url': 'https://hudle.in/venues/sample/1'}, None),
+    ]
+
+
+def _plan_stages(plan):
+    """Yield every stage name in an explain() plan tree"""
+    if not isinstance(plan, dict):
+        return
+    if 'stage' in plan:
+        yield plan['stage']
+    for key in ('inputStage', 'queryPlan'):
+        if key in plan:
+            yield from _plan_stages(plan[key])
+    for child in plan.get('inputStages', []):
+        yield from _plan_stages(child)
+
+
+def find_collscans(mongo_db):
+    """Explain each query shape; returns [(label, collection, stages)] for plans that scan the collection"""
+    collscans = []
+    for label, collection, query, sort in query_shapes():
+        command = {'find': collection, 'filter': query}
+        if sort:
+            command['sort'] = dict(sort)
+        explain = mongo_db.command('explain', command, verbosity='queryPlanner')
+        stages = list(_plan_stages(explain['queryPlanner']['winningPlan']))
+        if 'COLLSCAN' in stages:
+            collscans.append((label, collection, stages))
+    return collscans
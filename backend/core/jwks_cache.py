@@ -0,0 +1,99 @@
+# backend/core/jwks_cache.py
+import logging
+import threading
+import time
+
+from decouple import config
+
+from .http_client import clerk_client
+
+logger = logging.getLogger(__name__)
+
+# Clerk publishes its signing keys here; they rotate rarely, so we keep them in memory
+CLERK_JWKS_URL = config(
+    'CLERK_JWKS_URL',
+    default='https://rested-oyster-81.clerk.accounts.dev/.well-known/jwks.json',
+)
+JWKS_CACHE_TTL = config('JWKS_CACHE_TTL', default=3600, cast=int)
+JWKS_FETCH_TIMEOUT = config('JWKS_FETCH_TIMEOUT', default=5, cast=float)
+# Tokens with made-up kids must not turn into a refresh per request
+JWKS_MIN_REFRESH_INTERVAL = config('JWKS_MIN_REFRESH_INTERVAL', default=30, cast=int)
+# Until the first fetch succeeds every request fails auth, so retry much sooner than that
+JWKS_COLD_RETRY_INTERVAL = config('JWKS_COLD_RETRY_INTERVAL', default=1, cast=float)
+
+
+class JWKSKeyStore:
+    """In-process cache of Clerk signing keys indexed by `kid`.
+
+    Keys are refreshed when the TTL runs out or when a token names a kid we
+    have not seen. Only one thread fetches at a time; while a refresh of known
+    keys is in flight, other requests keep using the last good key set.
+    """
+
+    def __init__(self, url, ttl=JWKS_CACHE_TTL, timeout=JWKS_FETCH_TIMEOUT,
+                 min_refresh_interval=JWKS_MIN_REFRESH_INTERVAL, cold_retry_interval=JWKS_COLD_RETRY_INTERVAL):
+        self.url = url
+        self.ttl = ttl
+        self.timeout = timeout
+        self.min_refresh_interval = min_refresh_interval
+        self.cold_retry_interval = cold_retry_interval
+        self._keys = {}
+        self._fetched_at = None
+        self._last_attempt = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._fetched_at is not None
+
+    def _is_stale(self):
+        return self._fetched_at is None or time.monotonic() - self._fetched_at > self.ttl
+
+    def get_key(self, kid):
+        """Return the JWK for `kid`, or None if Clerk does not know it."""
+        key = self._keys.get(kid)
+        if key is not None and not self._is_stale():
+            return key
+
+        generation = self._generation
+        # Known kid: don't queue behind a slow refresh, serve the key we have
+        if not self._lock.acquire(blocking=key is None):
+            return key
+        try:
+            # Someone else refreshed while we waited for the lock
+            if self._generation == generation:
+                self._refresh()
+        finally:
+            self._lock.release()
+
+        return self._keys.get(kid, key)
+
+    def _refresh(self):
+        now = time.monotonic()
+        interval = self.min_refresh_interval if self.loaded else self.cold_retry_interval
+        if self._last_attempt is not None and now - self._last_attempt < interval:
+            return
+        self._last_attempt = now
+
+        try:
+            # Pooled keep-alive session; fails fast while Clerk's circuit is open
+            response = clerk_client.get(self.url, timeout=self.timeout)
+            response.raise_for_status()
+            jwks = response.json()
+        except Exception as e:
+            # Keep serving the previous keys until Clerk answers again
+            logger.warning("Error fetching JWKS: %s", e)
+            return
+
+        keys = {k['kid']: k for k in jwks.get('keys', []) if 'kid' in k}
+        if not keys:
+            logger.warning("JWKS response contained no keys, keeping previous key set")
+            return
+
+        self._keys = keys
+        self._fetched_at = now
+        self._generation += 1
+
+
+jwks_store = JWKSKeyStore(CLERK_JWKS_URL)
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+
+from core.indexes import dedupe_profiles, ensure_indexes, find_collscans, find_duplicates
+from core.mongo_connection import mongo_db
+
+
+class Command(BaseCommand):
+    help = "Create the Mongo indexes the API relies on and report queries that still scan a collection"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--skip-explain', action='store_true',
+                            help="Only create indexes, don't explain() the query shapes")
+        parser.add_argument('--dedupe-profiles', action='store_true',
+                            help="Delete all but the oldest profile per clerk_user_id before building indexes")
+
+    def handle(self, *args, **options):
+        if options['dedupe_profiles']:
+            deleted = dedupe_profiles(mongo_db)
+            self.stdout.write(f"Deleted {deleted} duplicate profiles")
+
+        created, failed = ensure_indexes(mongo_db)
+        for collection, names in created.items():
+            self.stdout.write(f"{collection}: {', '.join(names)}")
+        for collection, error in failed.items():
+            self.stdout.write(self.style.ERROR(f"{collection}: index build failed: {error}"))
+
+        if 'profiles' in failed:
+            duplicates = find_duplicates(mongo_db['profiles'], 'clerk_user_id', limit=5)
+            if duplicates:
+                sample = ', '.join(value for value, _ in duplicates)
+                self.stdout.write(self.style.ERROR(
+                    f"profiles has duplicate clerk_user_ids (e.g. {sample}); "
+                    "re-run with --dedupe-profiles to keep the oldest profile of each"
+                ))
+
+        if 'venues' in failed and find_duplicates(mongo_db['venues'], 'hudle_url', limit=1):
+            self.stdout.write(self.style.ERROR(
+                "venues has duplicate hudle_urls; run manage.py import_venues --merge-duplicates"
+            ))
+
+        if options['skip_explain']:
+            return
+
+        collscans = find_collscans(mongo_db)
+        if not collscans:
+            self.stdout.write(self.style.SUCCESS("All known query shapes use an index"))
+            return
+
+        for label, collection, stages in collscans:
+            self.stdout.write(self.style.WARNING(
+                f"COLLSCAN: {label} on {collection} ({' -> '.join(stages)})"
+            ))
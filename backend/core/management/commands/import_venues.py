@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand, CommandError
+from pymongo.errors import OperationFailure
+
+from core.indexes import INDEXES, find_duplicates
+from core.mongo_connection import mongo_db
+from core.venue_cache import invalidate_venue_cache
+from core.venue_import import VENUE_IMPORT_BATCH_SIZE, import_venues, merge_duplicate_venues, read_venue_rows
+
+
+class Command(BaseCommand):
+    help = ("Upsert venues from CSV or JSONL files, keyed by hudle_url. Columns/keys: "
+            "name, image_url, hudle_url, location, description")
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', help="CSV (with header row) or JSONL files")
+        parser.add_argument('--format', choices=['csv', 'jsonl'],
+                            help="File format; detected from the extension by default")
+        parser.add_argument('--batch-size', type=int, default=VENUE_IMPORT_BATCH_SIZE,
+                            help="Venues per bulk_write")
+        parser.add_argument('--merge-duplicates', action='store_true',
+                            help="Merge venues sharing a hudle_url into the oldest one (posts move with them)")
+
+    def handle(self, *args, **options):
+        if options['merge_duplicates']:
+            urls, removed = merge_duplicate_venues(mongo_db)
+            self.stdout.write(f"Merged {removed} duplicate venues across {urls} hudle_urls")
+
+        self.ensure_unique_index()
+
+        for path in options['paths']:
+            try:
+                stats = import_venues(mongo_db['venues'], read_venue_rows(path, options['format']),
+                                      batch_size=options['batch_size'])
+            except (OSError, ValueError) as e:
+                raise CommandError(f"{path}: {e}")
+
+            self.stdout.write(
+                f"{path}: {stats.read} rows in {stats.seconds:.1f}s ({stats.rows_per_second:.0f} rows/s, "
+                f"{stats.batches} batches) - {stats.upserted} new, {stats.modified} updated, "
+                f"{stats.unchanged} unchanged, {stats.duplicates} duplicate, {stats.skipped} without hudle_url"
+            )
+            if stats.errors:
+                self.stdout.write(self.style.WARNING(f"{path}: {stats.errors} venues failed to write"))
+
+        # Cheap and harmless alongside the change stream, which is off with VENUE_CACHE_WATCH=false
+        # and unavailable on standalone Mongo; other processes still fall back to the TTL there
+        invalidate_venue_cache()
+        self.stdout.write(self.style.SUCCESS("Venue import finished"))
+
+    def ensure_unique_index(self):
+        """The unique hudle_url index keeps re-runs and concurrent imports from duplicating venues"""
+        duplicates = find_duplicates(mongo_db['venues'], 'hudle_url', limit=5)
+        if duplicates:
+            sample = ', '.join(url for url, _ in duplicates)
+            raise CommandError(
+                f"Venues share a hudle_url (e.g. {sample}); re-run with --merge-duplicates "
+                "to merge them into the oldest venue before importing"
+            )
+        try:
+            mongo_db['venues'].create_indexes(INDEXES['venues'])
+        except OperationFailure as e:
+            raise CommandError(f"Could not build the venues hudle_url index: {e}")
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from core.conversations import mark_all_read, rebuild_summaries
+from core.indexes import INDEXES
+from core.mongo_connection import mongo_db
+
+
+class Command(BaseCommand):
+    help = "Rebuild the conversations summary collection from the messages collection"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mark-existing-read', action='store_true',
+                            help="First flag every stored message read, so unread counts start at 0. "
+                                 "Use once for messages stored before read flags were maintained")
+
+    def handle(self, *args, **options):
+        if options['mark_existing_read']:
+            self.stdout.write(f"Flagged {mark_all_read(mongo_db)} messages read")
+
+        mongo_db['conversations'].create_indexes(INDEXES['conversations'])
+        count = rebuild_summaries(mongo_db)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} conversation summaries"))
@@ -0,0 +1,124 @@
+# backend/core/middleware.py
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from decouple import config
+from django.conf import settings
+from django.urls import Resolver404, resolve
+
+from .db_monitoring import MONGO_N_PLUS_ONE_THRESHOLD, finish_request, start_request
+from .metrics import HTTP_IN_FLIGHT, HTTP_REQUEST_SECONDS, HTTP_RESPONSES
+
+logger = logging.getLogger(__name__)
+
+# Add X-DB-Queries / X-DB-Time to responses (always on with DEBUG)
+MONGO_QUERY_HEADERS = config('MONGO_QUERY_HEADERS', default=False, cast=bool)
+# Log a Mongo summary for every request, not just the ones flagged as N+1
+MONGO_QUERY_LOG = config('MONGO_QUERY_LOG', default=False, cast=bool)
+
+
+class QueryStatsMiddleware:
+    """Counts the Mongo commands and DB time of each request and flags repeated query shapes.
+
+    Works for sync and async views. Queries run while a streaming response is
+    being consumed are not counted.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.add_headers = MONGO_QUERY_HEADERS or settings.DEBUG
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats, token = start_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            finish_request(token)
+        return self.report(request, response, stats)
+
+    async def __acall__(self, request):
+        stats, token = start_request()
+        try:
+            response = await self.get_response(request)
+        finally:
+            finish_request(token)
+        return self.report(request, response, stats)
+
+    def report(self, request, response, stats):
+        if self.add_headers:
+            response['X-DB-Queries'] = str(stats.count)
+            response['X-DB-Time'] = f"{stats.total_ms:.1f}ms"
+
+        if MONGO_QUERY_LOG and stats.count:
+            logger.info("Mongo queries for %s %s", request.method, request.path, extra={
+                'db_queries': stats.count,
+                'db_time_ms': round(stats.total_ms, 1),
+                'db_collections': dict(stats.by_collection),
+            })
+
+        for shape, times in stats.repeated_shapes(MONGO_N_PLUS_ONE_THRESHOLD):
+            logger.warning("Possible N+1 in %s %s: %dx %s", request.method, request.path, times, shape)
+        return response
+
+
+def route_of(request):
+    """The URL pattern serving the request (e.g. api/messages/<str:other_user_id>/), so labels stay bounded"""
+    try:
+        return resolve(request.path_info).route
+    except Resolver404:
+        return 'unmatched'
+
+
+class MetricsMiddleware:
+    """Records per-route latency, status counts and in-flight requests for /api/metrics/.
+
+    For streaming responses (SSE, streamed lists) the latency is time to first byte.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        route, started = self.start(request)
+        status = 500
+        try:
+            response = self.get_response(request)
+            status = response.status_code
+            return response
+        finally:
+            self.finish(request, route, started, status)
+
+    async def __acall__(self, request):
+        route, started = self.start(request)
+        status = 500
+        try:
+            response = await self.get_response(request)
+            status = response.status_code
+            return response
+        finally:
+            self.finish(request, route, started, status)
+
+    def start(self, request):
+        route = route_of(request)
+        HTTP_IN_FLIGHT.inc(route=route)
+        return route, time.perf_counter()
+
+    def finish(self, request, route, started, status):
+        HTTP_IN_FLIGHT.dec(route=route)
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, method=request.method, route=route)
+        HTTP_RESPONSES.inc(method=request.method, route=route, status=status)
@@ -1,12 +1,41 @@
 # backend/core/mongo_connection.py
-from pymongo import MongoClient
+import asyncio
+
+from pymongo import AsyncMongoClient, MongoClient
 from decouple import config
 
+from .db_monitoring import event_listeners
+
 # Read the MongoDB connection string from environment variables
 MONGODB_URI = config('MONGODB_URI')
+# Connections the async client may hold open; shared by every request on the event loop
+MONGO_ASYNC_MAX_POOL_SIZE = config('MONGO_ASYNC_MAX_POOL_SIZE', default=100, cast=int)
 
 # Establish the MongoDB connection
-client = MongoClient(MONGODB_URI)
+client = MongoClient(MONGODB_URI, event_listeners=event_listeners())
 
 # Use the pickleball database on your Atlas cluster
 mongo_db = client['pickleball']
+
+_async_client = None
+_async_client_loop = None
+
+
+def get_async_mongo_db():
+    """The pickleball database on the process-wide AsyncMongoClient.
+
+    An async client is tied to the event loop it first runs on. Under an ASGI
+    server that is the single loop serving every request, so all async views
+    share one pool. A new loop (tests, scripts) gets a fresh client.
+    """
+    global _async_client, _async_client_loop
+
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client_loop is not loop:
+        _async_client = AsyncMongoClient(
+            MONGODB_URI,
+            maxPoolSize=MONGO_ASYNC_MAX_POOL_SIZE,
+            event_listeners=event_listeners(),
+        )
+        _async_client_loop = loop
+    return _async_client['pickleball']
@@ -0,0 +1,135 @@
+# backend/core/realtime.py
+import asyncio
+import logging
+import threading
+
+from decouple import config
+from django.utils.module_loading import import_string
+
+from .renderers import dumps
+
+logger = logging.getLogger(__name__)
+
+# Dotted path of the broker class; swap in a shared broker to fan out across processes
+REALTIME_BROKER = config('REALTIME_BROKER', default='core.realtime.InProcessBroker')
+# Events buffered per connection before the oldest are dropped (the client resyncs by polling)
+REALTIME_QUEUE_SIZE = config('REALTIME_QUEUE_SIZE', default=100, cast=int)
+# Serve the SSE stream; only safe under an ASGI server (asgi.py turns it on). Under WSGI
+# Django drains the endless generator into a list and pins the worker thread forever.
+REALTIME_SSE_ENABLED = config('REALTIME_SSE_ENABLED', default=False, cast=bool)
+# Seconds between keep-alive comments on idle streams
+REALTIME_HEARTBEAT_SECONDS = config('REALTIME_HEARTBEAT_SECONDS', default=25, cast=int)
+
+
+class Subscription:
+    """One connected client: an asyncio queue living on the event loop that serves it"""
+
+    def __init__(self, user_id, loop, maxsize=REALTIME_QUEUE_SIZE):
+        self.user_id = user_id
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=maxsize)
+
+    def offer(self, event):
+        """Enqueue from any thread without blocking the publisher"""
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event):
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout):
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class InProcessBroker:
+    """Fans events out to the subscribers connected to this process.
+
+    Publishing is safe from sync views running in worker threads. Brokers must
+    provide subscribe(user_id) -> Subscription, unsubscribe(subscription) and
+    publish(user_id, event).
+    """
+
+    def __init__(self):
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id):
+        subscription = Subscription(user_id, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscribers.get(subscription.user_id)
+            if subscriptions:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscribers[subscription.user_id]
+
+    def publish(self, user_id, event):
+        with self._lock:
+            subscriptions = list(self._subscribers.get(user_id, ()))
+        for subscription in subscriptions:
+            subscription.offer(event)
+        return len(subscriptions)
+
+    def connection_count(self):
+        with self._lock:
+            return sum(len(subscriptions) for subscriptions in self._subscribers.values())
+
+
+broker = import_string(REALTIME_BROKER)()
+
+
+def set_broker(new_broker):
+    """Replace the process-wide broker (e.g. with a local stand-in in tests)"""
+    global broker
+    broker = new_broker
+
+
+def publish(user_id, event):
+    try:
+        return broker.publish(user_id, event)
+    except Exception as e:
+        # Push is best effort; polling still delivers the message
+        logger.warning("Realtime publish failed: %s", e)
+        return 0
+
+
+class EventStream:
+    """SSE body for one user's stream.
+
+    Subscribes only once the server starts reading, so a client gone before the
+    first byte leaves nothing behind. Unsubscribes when the generator is
+    cancelled (ASGI disconnect) or when Django closes the response, whichever
+    comes first; closing the body iterator alone does not reach the generator.
+    """
+
+    def __init__(self, user_id, heartbeat=REALTIME_HEARTBEAT_SECONDS):
+        self.user_id = user_id
+        self.heartbeat = heartbeat
+        self._subscription = None
+
+    def __aiter__(self):
+        return self._events()
+
+    async def _events(self):
+        self._subscription = broker.subscribe(self.user_id)
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    event = await self._subscription.get(self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {dumps(event).decode()}\n\n"
+        finally:
+            self.close()
+
+    def close(self):
+        subscription, self._subscription = self._subscription, None
+        if subscription is not None:
+            broker.unsubscribe(subscription)
@@ -0,0 +1,38 @@
+# backend/core/renderers.py
+import json
+from datetime import date, datetime
+
+from bson import Decimal128, ObjectId
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # falls back to the stdlib encoder, same output, slower
+    orjson = None
+
+
+def bson_default(obj):
+    """Encode the BSON types Mongo documents carry; orjson handles datetimes itself"""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, Decimal128):
+        return str(obj.to_decimal())
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(data):
+    """Serialize to UTF-8 JSON bytes with ObjectId/datetime support"""
+    if orjson is not None:
+        return orjson.dumps(data, default=bson_default)
+    return json.dumps(data, default=bson_default, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+class BSONJSONRenderer(JSONRenderer):
+    """JSONRenderer that takes raw Mongo documents, so views don't need conversion loops"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return dumps(data)
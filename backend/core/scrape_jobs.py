@@ -0,0 +1,106 @@
+# backend/core/scrape_jobs.py
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from decouple import config
+
+# Scrapes running at once; each one also borrows browsers from the scraper's driver pool
+SCRAPE_JOB_WORKERS = config('SCRAPE_JOB_WORKERS', default=2, cast=int)
+# Jobs allowed to wait for a worker before new venues are turned away with 429
+SCRAPE_JOB_MAX_PENDING = config('SCRAPE_JOB_MAX_PENDING', default=10, cast=int)
+SCRAPE_JOB_RETRY_AFTER = config('SCRAPE_JOB_RETRY_AFTER', default=15, cast=int)
+# Finished jobs stay pollable for this long
+SCRAPE_JOB_TTL = config('SCRAPE_JOB_TTL', default=600, cast=int)
+
+
+class ScrapeQueueFull(Exception):
+    """Raised when the job queue has no room for another venue"""
+
+
+class ScrapeJobQueue:
+    """Runs scrapes on a bounded thread pool, one job per venue at a time.
+
+    Submitting a venue that already has a queued or running job returns that
+    job instead of starting another browser session.
+    """
+
+    def __init__(self, workers=SCRAPE_JOB_WORKERS, max_pending=SCRAPE_JOB_MAX_PENDING, ttl=SCRAPE_JOB_TTL):
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='scrape-job')
+        self._jobs = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def submit(self, venue_url, venue_name, run):
+        """Queue `run(venue_url, venue_name)`; returns (job, created)."""
+        with self._lock:
+            self._prune()
+
+            job_id = self._inflight.get(venue_url)
+            if job_id is not None:
+                return self._public(self._jobs[job_id]), False
+
+            pending = sum(1 for job in self._jobs.values() if job['status'] == 'queued')
+            if pending >= self.max_pending:
+                raise ScrapeQueueFull(f"{pending} scrape jobs already waiting")
+
+            job = {
+                'job_id': uuid.uuid4().hex,
+                'venue_url': venue_url,
+                'venue_name': venue_name,
+                'status': 'queued',
+                'result': None,
+                'error': None,
+                'created_at': datetime.now().isoformat(),
+                'finished_at': None,
+                '_finished_ts': None,
+            }
+            self._jobs[job['job_id']] = job
+            self._inflight[venue_url] = job['job_id']
+
+        self._executor.submit(self._run, job, run)
+        return self._public(job), True
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return self._public(job) if job else None
+
+    def _run(self, job, run):
+        with self._lock:
+            job['status'] = 'running'
+
+        try:
+            result = run(job['venue_url'], job['venue_name'])
+            status = 'error' if result.get('status') == 'error' else 'done'
+            error = result.get('error') if status == 'error' else None
+        except Exception as e:
+            result, status, error = None, 'error', str(e)
+
+        with self._lock:
+            job['result'] = result
+            job['status'] = status
+            job['error'] = error
+            job['finished_at'] = datetime.now().isoformat()
+            job['_finished_ts'] = time.monotonic()
+            self._inflight.pop(job['venue_url'], None)
+
+    def _prune(self):
+        cutoff = time.monotonic() - self.ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job['_finished_ts'] is not None and job['_finished_ts'] < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    @staticmethod
+    def _public(job):
+        return {k: v for k, v in job.items() if not k.startswith('_')}
+
+
+scrape_jobs = ScrapeJobQueue()
@@ -0,0 +1,41 @@
+# backend/core/slot_cache.py
+from datetime import datetime, timezone
+
+from decouple import config
+
+from .mongo_connection import mongo_db
+
+# Results younger than this are served as-is
+SLOT_CACHE_FRESH_SECONDS = config('SLOT_CACHE_FRESH_SECONDS', default=120, cast=int)
+# Up to this age results are served while a background scrape refreshes them; Mongo drops them after
+SLOT_CACHE_STALE_SECONDS = config('SLOT_CACHE_STALE_SECONDS', default=1800, cast=int)
+
+slot_cache_collection = mongo_db['slot_cache']
+
+
+def _age_seconds(stored_at):
+    if stored_at.tzinfo is None:
+        # pymongo hands back naive UTC datetimes
+        stored_at = stored_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (datetime.now(timezone.utc) - stored_at).total_seconds())
+
+
+def get_cached_slots(venue_url):
+    """Return (result, age_in_seconds) for a venue, or (None, None) when nothing usable is cached."""
+    doc = slot_cache_collection.find_one({'venue_url': venue_url}, {'_id': 0, 'result': 1, 'stored_at': 1})
+    if not doc:
+        return None, None
+
+    age = _age_seconds(doc['stored_at'])
+    # The TTL monitor only runs once a minute, so expired entries can still be found
+    if age > SLOT_CACHE_STALE_SECONDS:
+        return None, None
+    return doc['result'], age
+
+
+def store_slots(venue_url, result):
+    slot_cache_collection.update_one(
+        {'venue_url': venue_url},
+        {'$set': {'result': result, 'stored_at': datetime.now(timezone.utc)}},
+        upsert=True
+    )
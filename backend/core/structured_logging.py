@@ -0,0 +1,115 @@
+# backend/core/structured_logging.py
+"""JSON log records written by a background thread.
+
+Request threads only copy the record onto a bounded queue; a QueueListener
+formats and writes it. Wired up through LOGGING in settings.py.
+"""
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+# Attributes every LogRecord has; anything else came in through `extra=`
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+def parse_sample_rates(text):
+    """Parse "scraper=0.1,core.middleware=0.5" into {logger name: fraction kept}"""
+    rates = {}
+    for item in filter(None, (part.strip() for part in text.split(','))):
+        name, _, rate = item.partition('=')
+        rates[name.strip()] = float(rate)
+    return rates
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a fraction of a logger's records below WARNING; warnings and errors always pass.
+
+    `rates` maps logger names to the fraction kept and applies to child loggers too.
+    """
+
+    def __init__(self, rates=None):
+        super().__init__()
+        if isinstance(rates, str):
+            rates = parse_sample_rates(rates)
+        self.rates = rates or {}
+
+    def rate_for(self, name):
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition('.')[0]
+        return 1.0
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        rate = self.rate_for(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, extra fields and exception"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class BackgroundJSONHandler(QueueHandler):
+    """QueueHandler whose own listener thread writes JSON lines to `stream`.
+
+    The queue is bounded; when the writer falls behind, records are dropped
+    and counted instead of blocking the caller.
+    """
+
+    def __init__(self, stream=None, maxsize=10000):
+        super().__init__(queue.Queue(maxsize))
+        self.dropped = 0
+        target = logging.StreamHandler(stream or sys.stdout)
+        target.setFormatter(JSONFormatter())
+        self.listener = QueueListener(self.queue, target, respect_handler_level=True)
+        self.listener.start()
+        self._stopped = False
+        atexit.register(self.stop)
+
+    def prepare(self, record):
+        # Merge args now (they may change after we return); leave JSON encoding to the listener
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def stop(self):
+        """Flush queued records and stop the writer thread"""
+        if not self._stopped:
+            self._stopped = True
+            self.listener.stop()
+
+    def close(self):
+        self.stop()
+        super().close()
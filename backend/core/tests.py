@@ -1,3 +1,112 @@
-from django.test import TestCase
+import asyncio
+import os
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.test import RequestFactory, SimpleTestCase
+
+import scraper
+from core import realtime, views
+
+FIXTURE_DIR = os.path.join(settings.BASE_DIR, 'fixtures', 'hudle')
+
+
+class FakeScriptDriver:
+    """Answers READ_SLOT_TABLE_JS with a canned snapshot, as Chrome would"""
+
+    def __init__(self, table):
+        self.table = table
+
+    def execute_script(self, script, *args):
+        return self.table
+
+
+def without_scrape_time(slots):
+    return [{k: v for k, v in slot.items() if k != 'scraped_at'} for slot in slots]
+
+
+class SlotExtractModesTest(SimpleTestCase):
+    # What Chrome's innerText returns for court_view_pretty.html in script mode
+    PRETTY_SCRIPT_TABLE = {
+        'dates': ['17', '18', '19'],
+        'rows': [
+            [
+                {'text': '06:00 AM', 'classes': 'style_time__Qx81p', 'style': ''},
+                {'text': '1 left ₹ 500', 'classes': 'style_slot__k2LpA style_available__Zr0Yt', 'style': ''},
+                {'text': 'Booked', 'classes': 'style_slot__k2LpA style_booked__uT7aQ', 'style': ''},
+                {'text': '2 left ₹ 600', 'classes': 'style_slot__k2LpA style_available__Zr0Yt', 'style': ''},
+            ],
+            [
+                {'text': '06:30 AM', 'classes': 'style_time__Qx81p', 'style': ''},
+                {'text': '0 left\n₹ 800', 'classes': 'style_slot__k2LpA', 'style': ''},
+                {'text': '-', 'classes': 'style_slot__k2LpA', 'style': ''},
+                {'text': '₹\xa0800', 'classes': 'style_slot__k2LpA style_disabled__cV3x0', 'style': ''},
+            ],
+            [
+                {'text': '07:00 AM', 'classes': 'style_time__Qx81p', 'style': ''},
+                {'text': '1 left ₹ 1000', 'classes': 'style_slot__k2LpA style_available__Zr0Yt', 'style': ''},
+                {'text': 'Booked', 'classes': 'style_slot__k2LpA style_booked__uT7aQ', 'style': ''},
+                {'text': '3 left ₹ 600', 'classes': 'style_slot__k2LpA style_available__Zr0Yt', 'style': ''},
+            ],
+        ],
+    }
+
+    def read_fixture(self, name):
+        with open(os.path.join(FIXTURE_DIR, name), encoding='utf-8') as f:
+            return f.read()
+
+    def test_page_source_matches_inner_text_on_pretty_printed_markup(self):
+        html = self.read_fixture('court_view_pretty.html')
+        self.assertEqual(scraper.read_slot_table_from_html(html), self.PRETTY_SCRIPT_TABLE)
+
+    def test_page_source_and_script_modes_build_the_same_slots(self):
+        html = self.read_fixture('court_view_pretty.html')
+        from_html = scraper.build_slots(scraper.read_slot_table_from_html(html), 'Venue', 'Court 2')
+        from_script = scraper.build_slots(
+            scraper.read_slot_table(FakeScriptDriver(self.PRETTY_SCRIPT_TABLE)), 'Venue', 'Court 2'
+        )
+        self.assertTrue(from_html)
+        self.assertEqual(without_scrape_time(from_html), without_scrape_time(from_script))
+
+
+class MessageStreamDisconnectTest(SimpleTestCase):
+    def setUp(self):
+        self.broker = realtime.InProcessBroker()
+        self.addCleanup(realtime.set_broker, realtime.broker)
+        realtime.set_broker(self.broker)
+
+        authenticate = mock.patch.object(views, 'authenticate_token_async',
+                                         mock.AsyncMock(return_value=({'user_id': 'user_a'}, None)))
+        authenticate.start()
+        self.addCleanup(authenticate.stop)
+        self.request = RequestFactory().get('/api/messages/stream/', {'token': 'token'})
+
+    async def open_stream(self):
+        response = await views.message_stream(self.request)
+        content = aiter(response)
+        self.assertEqual(await anext(content), b'retry: 3000\n\n')
+        self.assertEqual(self.broker.connection_count(), 1)
+        return response, content
+
+    async def test_client_disconnect_unsubscribes(self):
+        # ASGIHandler cancels the response task when the client goes away
+        _, content = await self.open_stream()
+        waiting = asyncio.ensure_future(anext(content))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiting
+        self.assertEqual(self.broker.connection_count(), 0)
+
+    async def test_closing_the_response_unsubscribes(self):
+        # aclose() stops at Django's wrapper; the response close() must release the subscription
+        response, content = await self.open_stream()
+        await content.aclose()
+        await sync_to_async(response.close)()
+        self.assertEqual(self.broker.connection_count(), 0)
+
+    async def test_unread_stream_never_subscribes(self):
+        response = await views.message_stream(self.request)
+        await sync_to_async(response.close)()
+        self.assertEqual(self.broker.connection_count(), 0)
@@ -0,0 +1,77 @@
+# backend/core/token_cache.py
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from decouple import config
+
+TOKEN_CACHE_MAX_ENTRIES = config('TOKEN_CACHE_MAX_ENTRIES', default=10000, cast=int)
+# Upper bound on how long a verified token is trusted, even if its exp is further out
+TOKEN_CACHE_MAX_TTL = config('TOKEN_CACHE_MAX_TTL', default=300, cast=int)
+
+
+def _token_key(token):
+    # Never keep raw bearer tokens around in memory as dict keys
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of already-verified Clerk JWT claims, valid until the token's exp."""
+
+    def __init__(self, max_entries=TOKEN_CACHE_MAX_ENTRIES, max_ttl=TOKEN_CACHE_MAX_TTL):
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token):
+        key = _token_key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            payload, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(payload)
+
+    def put(self, token, payload):
+        exp = payload.get('exp')
+        if not exp:
+            # Tokens without an expiry are never cached
+            return
+
+        expires_at = min(float(exp), time.time() + self.max_ttl)
+        key = _token_key(token)
+        with self._lock:
+            self._entries[key] = (dict(payload), expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+token_cache = VerifiedTokenCache()
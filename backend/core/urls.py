@@ -1,10 +1,16 @@
+from decouple import config
 from django.urls import path
+
+from . import async_views
 from .views import (
     get_conversation,
     get_conversations,
     health_check,
+    metrics,
     get_profile,
     scrape_slots,
+    create_scrape_job,
+    scrape_job_status,
     send_message,
     update_profile,
     venue_list,
@@ -14,10 +20,26 @@ from .views import (
     post_detail,
     toggle_interest,
     get_my_posts,
+    message_stream,
+    message_stream_unavailable,
 )
+from .realtime import REALTIME_SSE_ENABLED
+
+# Serve the hot read endpoints from core.async_views (on by default under asgi.py)
+ASYNC_READ_VIEWS = config('ASYNC_READ_VIEWS', default=False, cast=bool)
+if ASYNC_READ_VIEWS:
+    venue_list = async_views.venue_list
+    list_posts = async_views.list_posts
+    get_conversation = async_views.get_conversation
+    get_conversations = async_views.get_conversations
+
+# Server-sent events need ASGI; everywhere else the clients fall back to polling
+if not REALTIME_SSE_ENABLED:
+    message_stream = message_stream_unavailable
 
 urlpatterns = [
     path('health/', health_check),
+    path('metrics/', metrics),                       # Prometheus text format
     path('profile/update/', update_profile),
     path('profile/', get_profile),
     path('venues/', venue_list),
@@ -28,7 +50,10 @@ urlpatterns = [
     path('posts/<str:post_id>/', post_detail),
     path('posts/<str:post_id>/interest/', toggle_interest),
     path('messages/send/', send_message),
+    path('messages/stream/', message_stream),           # SSE push of new messages
     path('messages/<str:other_user_id>/', get_conversation),
     path('conversations/', get_conversations),
     path('scrape-slots/', scrape_slots),
+    path('scrape-slots/jobs/', create_scrape_job),               # POST queue a scrape job
+    path('scrape-slots/jobs/<str:job_id>/', scrape_job_status),   # GET poll job status/result
 ]
\ No newline at end of file
@@ -0,0 +1,157 @@
+# backend/core/venue_cache.py
+import hashlib
+import json
+import logging
+import threading
+import time
+
+from decouple import config
+from pymongo.errors import OperationFailure, PyMongoError
+
+from .mongo_connection import mongo_db
+
+logger = logging.getLogger(__name__)
+
+# Safety net for deployments without change streams (they need a replica set, which Atlas has)
+VENUE_CACHE_TTL = config('VENUE_CACHE_TTL', default=600, cast=int)
+VENUE_CACHE_WATCH = config('VENUE_CACHE_WATCH', default=True, cast=bool)
+VENUE_CACHE_WATCH_MAX_BACKOFF = config('VENUE_CACHE_WATCH_MAX_BACKOFF', default=60, cast=int)
+
+# Server error codes: change streams unsupported (standalone mongod), resume point aged out of the oplog
+CHANGE_STREAMS_UNSUPPORTED = 40573
+CHANGE_STREAM_HISTORY_LOST = 286
+
+
+class VenueCache:
+    """Serialized venues kept in memory, stamped with a content hash used as the ETag.
+
+    Reloaded lazily after invalidate(), which is called by the change-stream
+    watcher or explicitly by code that writes venues.
+    """
+
+    def __init__(self, collection, ttl=VENUE_CACHE_TTL, watch=VENUE_CACHE_WATCH):
+        self.collection = collection
+        self.ttl = ttl
+        self.watch = watch
+        # (venues, venues_by_id, version, loaded_at), swapped as a whole so readers never see half a reload
+        self._snapshot = None
+        # Bumped by invalidate(); a load that started before a bump must not be stored
+        self._generation = 0
+        self._lock = threading.Lock()        # one reload at a time
+        self._swap_lock = threading.Lock()   # generation check + store vs invalidate(); never held across I/O
+        self._watcher = None
+
+    def _load(self):
+        return self._snapshot_of(list(self.collection.find()))
+
+    def _snapshot_of(self, venues):
+        for v in venues:
+            v['_id'] = str(v['_id'])
+
+        body = json.dumps(venues, sort_keys=True, default=str).encode()
+        # Same content gives the same stamp in every process, so ETags survive load balancing
+        version = hashlib.sha1(body).hexdigest()[:16]
+        return venues, {v['_id']: v for v in venues}, version, time.monotonic()
+
+    def _is_current(self, snapshot):
+        return snapshot is not None and time.monotonic() - snapshot[3] < self.ttl
+
+    def _current(self):
+        if self.watch and self._watcher is None:
+            self._start_watcher()
+
+        snapshot = self._snapshot
+        if self._is_current(snapshot):
+            return snapshot
+        with self._lock:
+            if not self._is_current(self._snapshot):
+                generation = self._generation
+                snapshot = self._load()
+                # If a write landed mid-load, serve this once but reload on the next call
+                self._store(snapshot, generation)
+                return snapshot
+            return self._snapshot
+
+    def all(self):
+        """Return (venues, etag)"""
+        venues, _, version, _ = self._current()
+        return venues, f'"{version}"'
+
+    async def all_async(self, async_collection):
+        """all() for async views: a current snapshot is served without I/O, a reload uses the async client.
+
+        Coroutines that miss together may each reload; the venues collection is small
+        and the last snapshot written wins.
+        """
+        if self.watch and self._watcher is None:
+            self._start_watcher()
+
+        snapshot = self._snapshot
+        if not self._is_current(snapshot):
+            generation = self._generation
+            snapshot = self._snapshot_of(await async_collection.find().to_list())
+            self._store(snapshot, generation)
+        venues, _, version, _ = snapshot
+        return venues, f'"{version}"'
+
+    def get(self, venue_id):
+        """Return (venue or None, etag) for a venue id string"""
+        _, by_id, version, _ = self._current()
+        return by_id.get(venue_id), f'"{version}-{venue_id}"'
+
+    def _store(self, snapshot, generation):
+        """Keep a freshly loaded snapshot unless invalidate() ran since its load began"""
+        with self._swap_lock:
+            if self._generation == generation:
+                self._snapshot = snapshot
+
+    def invalidate(self):
+        with self._swap_lock:
+            self._generation += 1
+            self._snapshot = None
+
+    def _start_watcher(self):
+        with self._lock:
+            if self._watcher is not None:
+                return
+            self._watcher = threading.Thread(target=self._watch, name='venue-cache-watch', daemon=True)
+            self._watcher.start()
+
+    def _watch(self):
+        """Invalidate on every venue change; reconnect with backoff, resuming after the last event seen"""
+        resume_token = None
+        reconnecting = False
+        backoff = 1
+        while True:
+            try:
+                with self.collection.watch(resume_after=resume_token) as stream:
+                    if reconnecting:
+                        # Writes may have landed while the stream was down
+                        self.invalidate()
+                        logger.info("Venue change stream reconnected")
+                    backoff = 1
+                    for _change in stream:
+                        resume_token = stream.resume_token
+                        self.invalidate()
+            except OperationFailure as e:
+                if e.code == CHANGE_STREAMS_UNSUPPORTED:
+                    # Standalone servers have no change streams; the TTL keeps the cache honest
+                    logger.warning("Venue change streams unavailable, relying on %ss TTL: %s", self.ttl, e)
+                    return
+                if e.code == CHANGE_STREAM_HISTORY_LOST:
+                    resume_token = None
+                logger.warning("Venue change stream failed, retrying in %ss: %s", backoff, e)
+            except PyMongoError as e:
+                logger.warning("Venue change stream failed, retrying in %ss: %s", backoff, e)
+
+            reconnecting = True
+            time.sleep(backoff)
+            backoff = min(backoff * 2, VENUE_CACHE_WATCH_MAX_BACKOFF)
+
+
+venue_cache = VenueCache(mongo_db['venues'])
+
+
+def invalidate_venue_cache():
+    """Hook for code that writes venues in this process"""
+    venue_cache.invalidate()
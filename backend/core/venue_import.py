@@ -0,0 +1,136 @@
+# backend/core/venue_import.py
+import csv
+import json
+import os
+import time
+from datetime import datetime
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+VENUE_FIELDS = ('name', 'image_url', 'hudle_url', 'location', 'description')
+VENUE_IMPORT_BATCH_SIZE = 1000
+
+FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}
+
+
+def detect_format(path):
+    fmt = FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise ValueError(f"Can't tell the format of {path}; use .csv or .jsonl, or pass it explicitly")
+    return fmt
+
+
+def read_venue_rows(path, fmt=None):
+    """Yield raw venue dicts from a CSV (with a header row) or JSONL file, one at a time"""
+    fmt = fmt or detect_format(path)
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        if fmt == 'csv':
+            yield from csv.DictReader(f)
+        else:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    raise ValueError(f"line {line_number}: {e}")
+
+
+def normalize_venue(row):
+    """Known venue fields as stripped strings; None when the row has no hudle_url to key on"""
+    venue = {}
+    for field in VENUE_FIELDS:
+        value = row.get(field)
+        if value is not None:
+            venue[field] = str(value).strip()
+    if not venue.get('hudle_url'):
+        return None
+    return venue
+
+
+class ImportStats:
+    def __init__(self):
+        self.read = 0
+        self.skipped = 0
+        self.duplicates = 0
+        self.upserted = 0
+        self.modified = 0
+        self.unchanged = 0
+        self.errors = 0
+        self.batches = 0
+        self.started = time.perf_counter()
+
+    @property
+    def seconds(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def rows_per_second(self):
+        return self.read / self.seconds if self.seconds else 0.0
+
+
+def _write_batch(collection, batch, stats):
+    """One unordered bulk_write; a failing document doesn't stop the rest of the batch"""
+    now = datetime.now()
+    requests = [
+        UpdateOne(
+            {'hudle_url': hudle_url},
+            {'$set': venue, '$setOnInsert': {'created_at': now}},
+            upsert=True,
+        )
+        for hudle_url, venue in batch.items()
+    ]
+    try:
+        result = collection.bulk_write(requests, ordered=False).bulk_api_result
+    except BulkWriteError as e:
+        result = e.details
+        stats.errors += len(result.get('writeErrors', []))
+
+    stats.batches += 1
+    stats.upserted += result.get('nUpserted', 0)
+    stats.modified += result.get('nModified', 0)
+    stats.unchanged += result.get('nMatched', 0) - result.get('nModified', 0)
+
+
+def merge_duplicate_venues(mongo_db):
+    """Collapse venues sharing a hudle_url into the oldest one, moving their posts onto it.
+
+    Re-runs of the old insert script created such duplicates; they block the
+    unique hudle_url index. Returns (duplicated urls, venues removed).
+    """
+    # Imported here so insert_venues.py can use this module without Django settings
+    from .indexes import find_duplicates
+
+    groups = find_duplicates(mongo_db['venues'], 'hudle_url')
+    removed = 0
+    for _, ids in groups:
+        keep, extras = ids[0], ids[1:]
+        mongo_db['posts'].update_many({'venue_id': {'$in': extras}}, {'$set': {'venue_id': keep}})
+        removed += mongo_db['venues'].delete_many({'_id': {'$in': extras}}).deleted_count
+    return len(groups), removed
+
+
+def import_venues(collection, rows, batch_size=VENUE_IMPORT_BATCH_SIZE, stats=None):
+    """Upsert venues keyed by hudle_url in batches; holds at most one batch in memory.
+
+    Re-running an import updates venues in place instead of duplicating them.
+    Within a batch the last row for a hudle_url wins. Returns ImportStats.
+    """
+    stats = stats or ImportStats()
+    batch = {}
+    for row in rows:
+        stats.read += 1
+        venue = normalize_venue(row)
+        if venue is None:
+            stats.skipped += 1
+            continue
+        if venue['hudle_url'] in batch:
+            stats.duplicates += 1
+        batch[venue['hudle_url']] = venue
+        if len(batch) >= batch_size:
+            _write_batch(collection, batch, stats)
+            batch = {}
+    if batch:
+        _write_batch(collection, batch, stats)
+    return stats
@@ -2,23 +2,44 @@ from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from decouple import config
 from .mongo_connection import mongo_db
-import requests
+from .jwks_cache import jwks_store
+from .token_cache import token_cache
+from .conversations import record_message, mark_read
+from . import realtime
+from .venue_cache import venue_cache, invalidate_venue_cache
+from .renderers import dumps
+from .metrics import AUTH_SECONDS, render_metrics
+from .http_client import CLERK_API_URL, clerk_client
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, JsonResponse
 from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 from datetime import datetime
 import hashlib
+import base64
+import logging
+import time
 from jose import jwt
 
+logger = logging.getLogger(__name__)
+
 def hash_text(text):
     """Hash any text for privacy"""
     return hashlib.sha256(text.encode()).hexdigest()[:32]
 
 CLERK_API_KEY = config('CLERK_API_KEY')
+# Refuse new interest once a post has players_needed interested users
+ENFORCE_POST_CAPACITY = config('ENFORCE_POST_CAPACITY', default=False, cast=bool)
 
 def verify_clerk_token(token):
     """Verify Clerk JWT and fetch Clerk user info."""
-    url = "https://api.clerk.com/v1/me"
     headers = {"Authorization": f"Bearer {token}"}
-    r = requests.get(url, headers=headers)
+    try:
+        r = clerk_client.get(f"{CLERK_API_URL}/me", headers=headers)
+    except Exception as e:
+        logger.warning("Clerk /me request failed: %s", e)
+        return None
     if r.status_code == 200:
         return r.json()
     return None
@@ -29,35 +50,90 @@ def get_authenticated_user(request):
         return None, Response({'error': 'Missing Clerk token'}, status=401)
     
     token = auth_header.replace('Bearer ', '')
-    jwks_url = 'https://rested-oyster-81.clerk.accounts.dev/.well-known/jwks.json'
-    
+    return authenticate_token(token)
+
+
+def authenticate_token(token):
+    """Verify a Clerk JWT; returns (payload, None) or (None, error Response)"""
+    # Polling clients resend the same token; it was already verified and its profile ensured
+    started = time.perf_counter()
+    cached_payload = token_cache.get(token)
+    if cached_payload is not None:
+        AUTH_SECONDS.observe(time.perf_counter() - started, cache='hit')
+        return cached_payload, None
+
+    with AUTH_SECONDS.time(cache='miss'):
+        return _verify_token(token)
+
+
+def _verify_token(token):
     try:
-        response = requests.get(jwks_url)
-        jwks = response.json()
+        kid = jwt.get_unverified_header(token).get('kid')
     except Exception as e:
-        print(f"Error fetching JWKS: {e}")
-        return None, Response({'error': 'Failed to fetch JWKS keys'}, status=500)
+        logger.info("JWT header error: %s", e)
+        return None, Response({'error': 'Invalid Clerk token'}, status=401)
+
+    signing_key = jwks_store.get_key(kid)
+    if signing_key is None:
+        if not jwks_store.loaded:
+            return None, Response({'error': 'Failed to fetch JWKS keys'}, status=500)
+        return None, Response({'error': 'Invalid Clerk token'}, status=401)
+
     try:
         payload = jwt.decode(
             token,
-            jwks,
+            signing_key,
             algorithms=['RS256'],
             options={"verify_aud": False}
         )
         
         # Automatically ensure profile exists for every authenticated request
         ensure_user_profile(mongo_db, payload)
-        
+
+        token_cache.put(token, payload)
         return payload, None
     except Exception as e:
-        print(f"JWT decode error: {e}")
+        logger.info("JWT decode error: %s", e)
         return None, Response({'error': 'Invalid Clerk token'}, status=401)
 
 
 
+async def authenticate_token_async(token):
+    """authenticate_token for async views; cached tokens never leave the event loop"""
+    started = time.perf_counter()
+    cached_payload = token_cache.get(token)
+    if cached_payload is not None:
+        AUTH_SECONDS.observe(time.perf_counter() - started, cache='hit')
+        return cached_payload, None
+    # First sight of this token: JWKS fetch and profile upsert run on the sync client.
+    # Straight to _verify_token, which caches the payload, so the miss is counted once
+    with AUTH_SECONDS.time(cache='miss'):
+        return await sync_to_async(_verify_token)(token)
+
+
+async def get_authenticated_user_async(request):
+    auth_header = request.headers.get('Authorization')
+    if not auth_header or not auth_header.startswith('Bearer '):
+        return None, Response({'error': 'Missing Clerk token'}, status=401)
+    return await authenticate_token_async(auth_header.replace('Bearer ', ''))
+
+
+def as_json_response(response):
+    """Turn a DRF error Response into a plain response for views outside DRF"""
+    return JsonResponse(response.data, status=response.status_code)
+
+
 @api_view(['GET'])
 def health_check(request):
-    return Response({'status': 'API is running!'})
+    return Response({
+        'status': 'API is running!',
+        'token_cache': token_cache.stats(),
+    })
+
+
+def metrics(request):
+    """Prometheus scrape target: request latency, status counts, in-flight requests, scraper phases"""
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
 
 
 @api_view(['PUT'])
@@ -83,49 +159,60 @@ def update_profile(request):
         {'$set': profile_update},
         upsert=True  # Create if doesn't exist
     )
+    _remember_profile(clerk_user_id)
     
     return Response({"message": "Profile updated successfully"})
 
 
+# Clerk user ids whose profile is known to exist, so steady-state requests skip Mongo
+_known_profile_ids = set()
+KNOWN_PROFILE_MEMO_SIZE = 50000
+
+
+def _remember_profile(clerk_user_id):
+    if len(_known_profile_ids) >= KNOWN_PROFILE_MEMO_SIZE:
+        _known_profile_ids.clear()
+    _known_profile_ids.add(clerk_user_id)
+
+
 def ensure_user_profile(mongo_db, user_data):
-    profiles = mongo_db['profiles']
-    print(f"Called for user: {user_data.get('user_id')}")
-    print(f"Available fields: {list(user_data.keys())}")
-    
-    # Check if user exists by Clerk user ID
-    existing = profiles.find_one({'clerk_user_id': user_data['user_id']})
-    
-    if not existing:
-        # Now we have reliable access to all fields
-        new_profile = {
-            'clerk_user_id': user_data['user_id'],
-            'email': user_data.get('email', ''),  # This will now work!
-            'username': '',
-            'full_name': user_data.get('name', ''),
-            'first_name': user_data.get('first_name', ''),
-            'last_name': user_data.get('last_name', ''),
-            'location': '',
-            'skill_level': '',
-            'created_at': datetime.now(),
-        }
-        profiles.insert_one(new_profile)
-        print(f"Created new profile with email: {user_data.get('email')}")
+    clerk_user_id = user_data['user_id']
+    if clerk_user_id in _known_profile_ids:
+        return
+
+    # Single idempotent upsert (unique clerk_user_id index comes from ensure_indexes): concurrent first requests can't create duplicates
+    new_profile = {
+        'clerk_user_id': clerk_user_id,
+        'email': user_data.get('email', ''),
+        'username': '',
+        'full_name': user_data.get('name', ''),
+        'first_name': user_data.get('first_name', ''),
+        'last_name': user_data.get('last_name', ''),
+        'location': '',
+        'skill_level': '',
+        'created_at': datetime.now(),
+    }
+    try:
+        mongo_db['profiles'].update_one(
+            {'clerk_user_id': clerk_user_id},
+            {'$setOnInsert': new_profile},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        # Lost the race to a concurrent upsert for the same user; the profile exists
+        pass
+
+    _remember_profile(clerk_user_id)
+
 
-        
 @api_view(['GET'])
 def get_profile(request):
     try:
-        print("=== get_profile endpoint called ===")
-        
         user_data, error = get_authenticated_user(request)
         if error:
             return error
         
-        print(f"User authenticated: {user_data.get('user_id')}")
-        
-        # Ensure profile exists
-        ensure_user_profile(mongo_db, user_data)
-        
+        # Profile was already ensured by get_authenticated_user
         # Fetch and return profile
         profile = mongo_db['profiles'].find_one(
             {'clerk_user_id': user_data['user_id']},  # Use 'user_id' from template
@@ -133,37 +220,51 @@ def get_profile(request):
         )
         
         if profile:
-            print("Profile found and returned")
             return Response(profile)
         else:
             return Response({'error': 'Profile not found'}, status=404)
             
     except Exception as e:
-        print(f"Exception: {str(e)}")
+        logger.exception("get_profile failed")
         return Response({'error': str(e)}, status=500)
 
 
 
+def not_modified(request, etag):
+    """True when the client's If-None-Match already names this ETag"""
+    if_none_match = request.headers.get('If-None-Match', '')
+    return etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*'
+
+
 @api_view(['GET'])
 def venue_list(request):
-    venues_collection = mongo_db['venues']
-    venues = list(venues_collection.find())
-    for v in venues:
-        v['_id'] = str(v['_id'])
-    return Response(venues)
+    # Served from memory; Mongo is only read after venues change
+    venues, etag = venue_cache.all()
+    if not_modified(request, etag):
+        return Response(status=304, headers={'ETag': etag})
+    return Response(venues, headers={'ETag': etag})
 
 
 @api_view(['GET'])
 def venue_detail(request, venue_id):
-    venues_collection = mongo_db['venues']
     try:
-        venue = venues_collection.find_one({'_id': ObjectId(venue_id)})
+        ObjectId(venue_id)
     except Exception:
         return Response({'error': 'Invalid venue ID'}, status=400)
+
+    venue, etag = venue_cache.get(venue_id)
     if not venue:
-        return Response({'error': 'Venue not found'}, status=404)
-    venue['_id'] = str(venue['_id'])
-    return Response(venue)
+        # Possibly written after our snapshot; check Mongo before answering 404
+        if not mongo_db['venues'].find_one({'_id': ObjectId(venue_id)}, {'_id': 1}):
+            return Response({'error': 'Venue not found'}, status=404)
+        invalidate_venue_cache()
+        venue, etag = venue_cache.get(venue_id)
+        if not venue:
+            return Response({'error': 'Venue not found'}, status=404)
+
+    if not_modified(request, etag):
+        return Response(status=304, headers={'ETag': etag})
+    return Response(venue, headers={'ETag': etag})
 
 
 @api_view(['POST'])
@@ -172,7 +273,8 @@ def create_post(request):
     if error:
         return error
 
-    # Debug: Print all available user data
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Available user fields: %s", sorted(user_data))
 
     data = request.data
 
@@ -210,8 +312,7 @@ def create_post(request):
     else:
         user_name = 'Anonymous'
 
-    print(f"Profile found: {profile is not None}")
-    print(f"Final user name: '{user_name}'")
+    logger.debug("Post author resolved", extra={'profile_found': profile is not None, 'user_name': user_name})
 
     post_doc = {
         'venue_id': venue_obj_id,
@@ -230,33 +331,110 @@ def create_post(request):
     return Response({"message": "Post created", "post_id": str(result.inserted_id)})
 
 
-@api_view(['GET'])
-def list_posts(request):
-    venue_id = request.query_params.get('venue_id')
+POSTS_PAGE_SIZE = 20
+POSTS_MAX_PAGE_SIZE = 100
+
+
+def encode_posts_cursor(game_datetime, post_id):
+    raw = f"{game_datetime.isoformat()}|{post_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_posts_cursor(cursor):
+    raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+    game_datetime, post_id = raw.split('|', 1)
+    return datetime.fromisoformat(game_datetime), ObjectId(post_id)
+
+
+# interested_users is missing on posts nobody has joined yet
+INTERESTED_USERS = {'$ifNull': ['$interested_users', []]}
+
+
+def parse_posts_request(params):
+    """Validate list_posts params; returns ((query, projection, limit), None) or (None, error Response)"""
+    venue_id = params.get('venue_id')
     if not venue_id:
-        return Response({"error": "venue_id query param required"}, status=400)
+        return None, Response({"error": "venue_id query param required"}, status=400)
 
     try:
         venue_obj_id = ObjectId(venue_id)
     except Exception:
-        return Response({"error": "Invalid venue_id"}, status=400)
+        return None, Response({"error": "Invalid venue_id"}, status=400)
 
-    now = datetime.now()
-    posts_cursor = mongo_db['posts'].find({
+    try:
+        limit = min(max(int(params.get('limit', POSTS_PAGE_SIZE)), 1), POSTS_MAX_PAGE_SIZE)
+    except ValueError:
+        return None, Response({"error": "limit must be an integer"}, status=400)
+
+    query = {
         'venue_id': venue_obj_id,
-        'game_datetime': {'$gte': now}
-    })
+        'game_datetime': {'$gte': datetime.now()}
+    }
+
+    cursor = params.get('cursor')
+    if cursor:
+        try:
+            after_datetime, after_id = decode_posts_cursor(cursor)
+        except Exception:
+            return None, Response({"error": "Invalid cursor"}, status=400)
+        # Keyset pagination on (game_datetime, _id)
+        query['$or'] = [
+            {'game_datetime': {'$gt': after_datetime}},
+            {'game_datetime': after_datetime, '_id': {'$gt': after_id}},
+        ]
+
+    projection = {
+        'venue_id': 1,
+        'title': 1,
+        'skill_level': 1,
+        'game_datetime': 1,
+        'description': 1,
+        'players_needed': 1,
+        'created_by': 1,
+        'created_by_name': 1,
+        'created_at': 1,
+        'interested_count': {'$size': INTERESTED_USERS},
+    }
+    return (query, projection, limit), None
 
-    posts = []
-    for p in posts_cursor:
-        p['_id'] = str(p['_id'])
-        p['venue_id'] = str(p['venue_id'])
-        p['interested_count'] = len(p.get('interested_users', []))
-        p['game_datetime'] = p['game_datetime'].isoformat()
-        p['created_at'] = p['created_at'].isoformat()
-        posts.append(p)
 
-    return Response(posts)
+def posts_page(posts, limit):
+    """Response body for a page fetched with limit + 1 rows"""
+    next_cursor = None
+    if len(posts) > limit:
+        posts = posts[:limit]
+        next_cursor = encode_posts_cursor(posts[-1]['game_datetime'], posts[-1]['_id'])
+
+    # ObjectIds and datetimes are encoded by the renderer
+    return {'posts': posts, 'next_cursor': next_cursor}
+
+
+@api_view(['GET'])
+def list_posts(request):
+    """Upcoming posts for a venue ordered by game time, one page at a time.
+
+    Query params: venue_id (required), limit, cursor (next_cursor from the previous page).
+    interested_count - and is_interested when a Clerk token is sent - are
+    computed by Mongo; the interested_users array is never returned.
+    """
+    parsed, error = parse_posts_request(request.query_params)
+    if error:
+        return error
+    query, projection, limit = parsed
+
+    # The list is public; a valid token only adds the caller's own interest flag
+    if request.headers.get('Authorization'):
+        user_data, error = get_authenticated_user(request)
+        if not error:
+            projection['is_interested'] = {'$in': [user_data['user_id'], INTERESTED_USERS]}
+
+    posts = list(
+        mongo_db['posts'].find(query, projection)
+        .sort([('game_datetime', 1), ('_id', 1)])
+        .limit(limit + 1)
+    )
+
+    return Response(posts_page(posts, limit))
 
 @api_view(['PUT', 'DELETE'])
 def post_detail(request, post_id):
@@ -322,24 +500,41 @@ def toggle_interest(request, post_id):
     except Exception:
         return Response({"error": "Invalid post ID"}, status=400)
 
-    post = mongo_db['posts'].find_one({'_id': post_obj_id})
-    if not post:
-        return Response({"error": "Post not found"}, status=404)
-
-    # Fix: Use 'user_id' instead of 'id'
     clerk_user_id = user_data['user_id']
-    interested_users = post.get('interested_users', [])
-
-    if clerk_user_id in interested_users:
-        interested_users.remove(clerk_user_id)
-        action = 'removed'
-    else:
-        interested_users.append(clerk_user_id)
-        action = 'added'
-
-    mongo_db['posts'].update_one({'_id': post_obj_id}, {'$set': {'interested_users': interested_users}})
+    is_interested = {'$in': [clerk_user_id, INTERESTED_USERS]}
+    # Refuse to add in the same operation if the game is full
+    can_join = {'$lt': [{'$size': INTERESTED_USERS}, '$players_needed']} if ENFORCE_POST_CAPACITY else {'$literal': True}
+
+    # One atomic pipeline update toggles membership; the returned pre-update document
+    # says which branch ran, and only the count travels back, never the array
+    post = mongo_db['posts'].find_one_and_update(
+        {'_id': post_obj_id},
+        [{'$set': {'interested_users': {'$cond': [
+            is_interested,
+            # $filter rather than $setDifference keeps the order people joined in
+            {'$filter': {'input': INTERESTED_USERS, 'cond': {'$ne': ['$$this', clerk_user_id]}}},
+            {'$cond': [can_join, {'$concatArrays': [INTERESTED_USERS, [clerk_user_id]]}, INTERESTED_USERS]},
+        ]}}}],
+        projection={
+            '_id': 0,
+            'interested_count': {'$size': INTERESTED_USERS},
+            'was_interested': is_interested,
+            'could_join': can_join,
+        },
+        return_document=ReturnDocument.BEFORE
+    )
+    if post is None:
+        return Response({"error": "Post not found"}, status=404)
 
-    return Response({"message": f"Interest {action}"})
+    count = post['interested_count']
+    if post['was_interested']:
+        return Response({"message": "Interest removed", "interested": False,
+                         "interested_count": count - 1})
+    if post['could_join']:
+        return Response({"message": "Interest added", "interested": True,
+                         "interested_count": count + 1})
+    return Response({"error": "This game already has enough players",
+                     "interested_count": count}, status=409)
 
 
 @api_view(['GET'])
@@ -348,27 +543,32 @@ def get_my_posts(request):
     if error:
         return error
 
-    posts_cursor = mongo_db['posts'].find({'created_by': user_data['user_id']})
-    posts = []
-    for p in posts_cursor:
-        p['_id'] = str(p['_id'])
-        p['venue_id'] = str(p['venue_id'])
-        p['game_datetime'] = p['game_datetime'].isoformat()
-        p['created_at'] = p['created_at'].isoformat()
+    posts = list(mongo_db['posts'].find({'created_by': user_data['user_id']}))
 
+    # One profile query for every interested user across all posts
+    interested_ids = {user_id for p in posts for user_id in p.get('interested_users', [])}
+    profiles_by_id = {}
+    if interested_ids:
+        profiles_cursor = mongo_db['profiles'].find(
+            {'clerk_user_id': {'$in': list(interested_ids)}},
+            {'_id': 0, 'clerk_user_id': 1, 'first_name': 1, 'last_name': 1, 'full_name': 1, 'skill_level': 1}
+        )
+        profiles_by_id = {profile['clerk_user_id']: profile for profile in profiles_cursor}
+
+    for p in posts:
         # Lookup interested user profiles
         interested_profiles = []
         for user_id in p.get('interested_users', []):
-            profile = mongo_db['profiles'].find_one({'clerk_user_id': user_id})
+            profile = profiles_by_id.get(user_id)
             if profile:
                 # Construct name from first_name + last_name
                 first_name = profile.get('first_name', '')
                 last_name = profile.get('last_name', '')
                 full_name = f"{first_name} {last_name}".strip()
-                
+
                 if not full_name:  # fallback if both are empty
                     full_name = profile.get('full_name', 'Anonymous')
-                
+
                 interested_profiles.append({
                     'user_id': user_id,
                     'full_name': full_name,
@@ -381,9 +581,8 @@ def get_my_posts(request):
                     'full_name': 'Anonymous',
                     'skill_level': '',
                 })
-        
+
         p['interested_profiles'] = interested_profiles
-        posts.append(p)
 
     return Response(posts)
 
@@ -414,124 +613,228 @@ def send_message(request):
         'read': False
     }
     
-    mongo_db['messages'].insert_one(message_doc)
+    result = mongo_db['messages'].insert_one(message_doc)
+    record_message(mongo_db, message_doc['sender_id'], message_doc['receiver_id'], message_doc['timestamp'])
+
+    # Push to the receiver's open streams, in the same shape get_conversation returns
+    realtime.publish(message_doc['receiver_id'], {
+        'type': 'message',
+        'message': {
+            '_id': result.inserted_id,
+            'sender_id': message_doc['sender_id'],
+            'receiver_id': message_doc['receiver_id'],
+            'message_encrypted': message_doc['message_encrypted'],
+            'timestamp': message_doc['timestamp'],
+            'read': False,
+            'sender_name': sender_name,
+        },
+    })
     return Response({'message': 'Message sent securely'})
 
 
-@api_view(['GET'])
-def get_conversation(request, other_user_id):
-    user_data, error = get_authenticated_user(request)
-    if error:
-        return error
-    
-    messages = list(mongo_db['messages'].find({
+CHAT_PAGE_SIZE = 50
+CHAT_MAX_PAGE_SIZE = 200
+
+
+def display_name(profile):
+    """'First Last' for a profile document, 'Anonymous' when missing or blank"""
+    if not profile:
+        return 'Anonymous'
+    first_name = profile.get('first_name', '')
+    last_name = profile.get('last_name', '')
+    return f"{first_name} {last_name}".strip() or 'Anonymous'
+
+
+NAME_PROJECTION = {'_id': 0, 'clerk_user_id': 1, 'first_name': 1, 'last_name': 1}
+
+
+def parse_conversation_request(params, current_user_id, other_user_id):
+    """Build the messages query for get_conversation.
+
+    Returns ((query, projection, sort, limit), None) or (None, error Response);
+    limit is None for incremental `since` polls. Pages fetched newest-first
+    must be reversed by the caller.
+    """
+    since = params.get('since')
+    before = params.get('before')
+
+    try:
+        limit = min(int(params.get('limit', CHAT_PAGE_SIZE)), CHAT_MAX_PAGE_SIZE)
+        since = datetime.fromisoformat(since) if since else None
+        before = datetime.fromisoformat(before) if before else None
+    except ValueError:
+        return None, Response({"error": "since/before must be ISO8601 and limit an integer"}, status=400)
+
+    query = {
         '$or': [
-            {'sender_id': user_data['user_id'], 'receiver_id': other_user_id},
-            {'sender_id': other_user_id, 'receiver_id': user_data['user_id']}
+            {'sender_id': current_user_id, 'receiver_id': other_user_id},
+            {'sender_id': other_user_id, 'receiver_id': current_user_id}
         ]
-    }).sort('timestamp', 1))
-    
-    # Process messages for frontend display
+    }
+    projection = {'message_hash': 0, 'sender_name_hash': 0}
+
+    if since is not None:
+        # Incremental poll: everything newer than what the client already has
+        query['timestamp'] = {'$gt': since}
+        return (query, projection, 1, None), None
+
+    # Latest page, or the page just before `before`, fetched newest-first
+    if before is not None:
+        query['timestamp'] = {'$lt': before}
+    return (query, projection, -1, max(limit, 1)), None
+
+
+def has_incoming(messages, current_user_id):
+    return any(msg['sender_id'] != current_user_id for msg in messages)
+
+
+def prepare_messages(messages, current_user_id, other_user_name):
+    """Process messages for frontend display"""
     for msg in messages:
-        msg['_id'] = str(msg['_id'])
-        msg['timestamp'] = msg['timestamp'].isoformat()
-        
         # Send encrypted message to frontend (it will decrypt client-side)
-        if 'message_encrypted' in msg:
-            msg['message_encrypted'] = msg['message_encrypted']
-        else:
+        if 'message_encrypted' not in msg:
             msg['message_encrypted'] = msg.get('message', '')
-        
-        # Get actual sender name for display (not from hash)
-        if msg['sender_id'] == user_data['user_id']:
-            msg['sender_name'] = 'You'
-        else:
-            # Get other user's profile for display
-            other_profile = mongo_db['profiles'].find_one({'clerk_user_id': msg['sender_id']})
-            if other_profile:
-                first_name = other_profile.get('first_name', '')
-                last_name = other_profile.get('last_name', '')
-                msg['sender_name'] = f"{first_name} {last_name}".strip() or 'Anonymous'
-            else:
-                msg['sender_name'] = 'Anonymous'
-        
-        # Remove hash fields from response (not needed by frontend)
-        msg.pop('message_hash', None)
-        msg.pop('sender_name_hash', None)
-    
-    return Response(messages)
+
+        msg['sender_name'] = 'You' if msg['sender_id'] == current_user_id else other_user_name
+    return messages
+
+
 @api_view(['GET'])
-def get_conversations(request):
+def get_conversation(request, other_user_id):
+    """Messages between the current user and `other_user_id`, oldest first.
+
+    Query params:
+      since  - ISO timestamp of the newest message the client has; only newer ones are returned
+      before - ISO timestamp of the oldest message the client has; returns the page before it
+      limit  - page size for the initial load and `before` pages
+    Without `since` or `before` the most recent page is returned.
+    """
     user_data, error = get_authenticated_user(request)
     if error:
         return error
-    
+
     current_user_id = user_data['user_id']
-    
-    # Find all unique users who have had conversations with current user
-    messages = list(mongo_db['messages'].find({
-        '$or': [
-            {'sender_id': current_user_id},
-            {'receiver_id': current_user_id}
-        ]
-    }))
-    
-    # Extract unique user IDs (excluding current user)
-    unique_users = set()
-    for msg in messages:
-        if msg['sender_id'] == current_user_id:
-            unique_users.add(msg['receiver_id'])
-        elif msg['receiver_id'] == current_user_id:
-            unique_users.add(msg['sender_id'])
-    
+    parsed, error = parse_conversation_request(request.query_params, current_user_id, other_user_id)
+    if error:
+        return error
+    query, projection, sort, limit = parsed
+
+    cursor = mongo_db['messages'].find(query, projection).sort('timestamp', sort)
+    if limit is not None:
+        cursor = cursor.limit(limit)
+    messages = list(cursor)
+    if sort < 0:
+        messages.reverse()
+
+    # Other participant's name is looked up once per response, only if they appear in it
+    other_user_name = None
+    if has_incoming(messages, current_user_id):
+        other_user_name = display_name(mongo_db['profiles'].find_one(
+            {'clerk_user_id': other_user_id}, NAME_PROJECTION
+        ))
+
+        # The user has now seen the other side's messages
+        mark_read(mongo_db, current_user_id, other_user_id)
+
+    return Response(prepare_messages(messages, current_user_id, other_user_name))
+
+
+def other_participant(summary, current_user_id):
+    others = [user_id for user_id in summary['participants'] if user_id != current_user_id]
+    return others[0] if others else current_user_id
+
+
+def conversation_rows(summaries, current_user_id, names):
     conversations = []
+    for summary in summaries:
+        other_user_id = other_participant(summary, current_user_id)
+        conversations.append({
+            'user_id': other_user_id,
+            'user_name': names.get(other_user_id, 'Anonymous'),
+            'last_message': 'New message',  # Generic preview for privacy
+            'last_message_time': summary['last_message_time'],
+            'last_sender_id': summary['last_sender_id'],
+            'unread_count': summary.get('unread', {}).get(current_user_id, 0),
+        })
+    return conversations
+
+
+@api_view(['GET'])
+def get_conversations(request):
+    user_data, error = get_authenticated_user(request)
+    if error:
+        return error
     
-    for other_user_id in unique_users:
-        # Get last message for this conversation
-        last_message = mongo_db['messages'].find({
-            '$or': [
-                {'sender_id': current_user_id, 'receiver_id': other_user_id},
-                {'sender_id': other_user_id, 'receiver_id': current_user_id}
-            ]
-        }).sort('timestamp', -1).limit(1)
-        
-        last_message = list(last_message)
-        if last_message:
-            last_msg = last_message[0]
-            
-            # Get other user's profile info
-            other_profile = mongo_db['profiles'].find_one({'clerk_user_id': other_user_id})
-            if other_profile:
-                first_name = other_profile.get('first_name', '')
-                last_name = other_profile.get('last_name', '')
-                other_user_name = f"{first_name} {last_name}".strip() or 'Anonymous'
-            else:
-                other_user_name = 'Anonymous'
-            
-            conversations.append({
-                'user_id': other_user_id,
-                'user_name': other_user_name,
-                'last_message': 'New message',  # Generic preview for privacy
-                'last_message_time': last_msg['timestamp'].isoformat(),
-                'last_sender_id': last_msg['sender_id'],
-                'unread_count': 0  # You can implement this later
-            })
-    
-    # Sort by last message time (most recent first)
-    conversations.sort(key=lambda x: x['last_message_time'], reverse=True)
+    current_user_id = user_data['user_id']
     
-    return Response(conversations)
+    # One indexed query over the per-pair summaries maintained by send_message
+    summaries = list(mongo_db['conversations'].find(
+        {'participants': current_user_id}
+    ).sort('last_message_time', -1))
+
+    # Resolve every counterpart's name in one query
+    names = {}
+    other_user_ids = [other_participant(summary, current_user_id) for summary in summaries]
+    if other_user_ids:
+        profiles_cursor = mongo_db['profiles'].find(
+            {'clerk_user_id': {'$in': other_user_ids}}, NAME_PROJECTION
+        )
+        names = {profile['clerk_user_id']: display_name(profile) for profile in profiles_cursor}
+
+    return Response(conversation_rows(summaries, current_user_id, names))
 
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework.decorators import api_view
-from django.http import JsonResponse
-from scraper import scrape_venue_slots
+from django.http import StreamingHttpResponse
+from scraper import (
+    scrape_venue_slots,
+    scrape_venue_slots_parallel,
+    driver_pool,
+    DriverPoolExhausted,
+    SCRAPER_PARALLEL_COURTS,
+)
+from .slot_cache import (
+    get_cached_slots,
+    store_slots,
+    SLOT_CACHE_FRESH_SECONDS,
+)
+from .scrape_jobs import scrape_jobs, ScrapeQueueFull, SCRAPE_JOB_RETRY_AFTER
 import json
 
+
+def run_scrape(venue_url, venue_name):
+    """Scrape a venue on pooled browsers and cache the result if every court succeeded
+
+    Partial results (some courts failed) are returned but not cached, so the
+    next request scrapes again instead of serving missing courts as fresh.
+    """
+    if SCRAPER_PARALLEL_COURTS:
+        result = scrape_venue_slots_parallel(venue_url, venue_name)
+    else:
+        with driver_pool.borrow() as driver:
+            result = scrape_venue_slots(venue_url, venue_name, driver=driver)
+
+    if result.get('status') == 'success':
+        store_slots(venue_url, result)
+    return result
+
+
+def slots_response(result, age, cache_status):
+    response = JsonResponse(result)
+    response['Age'] = str(int(age))
+    response['X-Cache'] = cache_status
+    return response
+
+
 @csrf_exempt
 @api_view(['POST'])
 def scrape_slots(request):
-    """API endpoint to scrape venue slots - no authentication required"""
+    """API endpoint to scrape venue slots - no authentication required
+
+    Cached results younger than SLOT_CACHE_FRESH_SECONDS are returned directly;
+    older ones are returned while a background scrape refreshes them. Clients
+    can demand fresher data with ?max_age=<seconds>.
+    """
     try:
         data = json.loads(request.body)
         venue_url = data.get('venue_url')
@@ -539,19 +842,118 @@ def scrape_slots(request):
         
         if not venue_url:
             return JsonResponse({'error': 'venue_url is required'}, status=400)
+
+        max_age = request.query_params.get('max_age')
+        if max_age is not None:
+            try:
+                max_age = int(max_age)
+            except ValueError:
+                return JsonResponse({'error': 'max_age must be an integer'}, status=400)
+
+        cached, age = get_cached_slots(venue_url)
+        if cached is not None:
+            if age <= (max_age if max_age is not None else SLOT_CACHE_FRESH_SECONDS):
+                return slots_response(cached, age, 'HIT')
+            if max_age is None:
+                # Refresh through the job queue so a burst of stale hits triggers one scrape
+                try:
+                    scrape_jobs.submit(venue_url, venue_name, run_scrape)
+                except ScrapeQueueFull:
+                    pass
+                return slots_response(cached, age, 'STALE')
         
-        print(f"🎯 API Request: Scraping {venue_name}")
+        logger.info("Scraping venue on request", extra={'venue_name': venue_name})
         
-        # Run the headless scraper
-        result = scrape_venue_slots(venue_url, venue_name)
+        # Run the headless scraper on warm pooled browsers
+        try:
+            result = run_scrape(venue_url, venue_name)
+        except DriverPoolExhausted as e:
+            return JsonResponse({'status': 'error', 'error': str(e)}, status=503)
         
         if result.get('status') == 'error':
             return JsonResponse(result, status=500)
         
-        return JsonResponse(result)
+        return slots_response(result, 0, 'MISS')
         
     except Exception as e:
         return JsonResponse({
             'status': 'error',
             'error': str(e)
         }, status=500)
+
+
+def queue_full_response(e):
+    response = JsonResponse({'status': 'error', 'error': str(e)}, status=429)
+    response['Retry-After'] = str(SCRAPE_JOB_RETRY_AFTER)
+    return response
+
+
+@csrf_exempt
+@api_view(['POST'])
+def create_scrape_job(request):
+    """Queue a venue scrape and return a job id to poll - no authentication required
+
+    A fresh cached result is returned straight away as a finished job. Requests
+    for a venue that is already being scraped share the in-flight job.
+    """
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid JSON body'}, status=400)
+
+    venue_url = data.get('venue_url')
+    venue_name = data.get('venue_name', 'Unknown Venue')
+    if not venue_url:
+        return JsonResponse({'error': 'venue_url is required'}, status=400)
+
+    cached, age = get_cached_slots(venue_url)
+    if cached is not None and age <= SLOT_CACHE_FRESH_SECONDS:
+        return slots_response({'job_id': None, 'status': 'done', 'result': cached}, age, 'HIT')
+
+    try:
+        job, created = scrape_jobs.submit(venue_url, venue_name, run_scrape)
+    except ScrapeQueueFull as e:
+        return queue_full_response(e)
+
+    response = JsonResponse(job, status=202)
+    response['Location'] = f"/api/scrape-slots/jobs/{job['job_id']}/"
+    return response
+
+
+@api_view(['GET'])
+def scrape_job_status(request, job_id):
+    """Poll a scrape job; 'result' is filled in once status is 'done'"""
+    job = scrape_jobs.get(job_id)
+    if job is None:
+        return JsonResponse({'error': 'Job not found'}, status=404)
+    return JsonResponse(job)
+
+
+def message_stream_unavailable(request):
+    """Stand-in for message_stream when not running under ASGI.
+
+    204 tells EventSource not to reconnect, so clients just keep polling.
+    """
+    return HttpResponse(status=204)
+
+
+async def message_stream(request):
+    """Server-sent events carrying new messages for the authenticated user.
+
+    EventSource cannot send headers, so the Clerk token comes as ?token=.
+    Needs an ASGI server (e.g. uvicorn pickleball_backend.asgi:application);
+    the polling endpoints keep working as a fallback.
+    """
+    token = request.GET.get('token', '')
+    if not token:
+        return JsonResponse({'error': 'Missing Clerk token'}, status=401)
+
+    user_data, error = await authenticate_token_async(token)
+    if error:
+        return as_json_response(error)
+
+    # Django calls EventStream.close() when it closes the response
+    response = StreamingHttpResponse(realtime.EventStream(user_data['user_id']), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -12,5 +12,9 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "pickleball_backend.settings")
+# Hot read endpoints run as async views on the shared AsyncMongoClient here
+os.environ.setdefault("ASYNC_READ_VIEWS", "true")
+# The message stream holds a connection open per client, which only ASGI can afford
+os.environ.setdefault("REALTIME_SSE_ENABLED", "true")
 
 application = get_asgi_application()
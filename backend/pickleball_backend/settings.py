@@ -24,7 +24,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',  # outermost, so latency covers the whole stack
     'corsheaders.middleware.CorsMiddleware',
+    'core.middleware.QueryStatsMiddleware',  # per-request Mongo query counts
     'django.middleware.security.SecurityMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',  # required for messages
@@ -50,11 +52,41 @@ CORS_ALLOWED_ORIGINS = [
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [],
     'DEFAULT_PERMISSION_CLASSES': [],
-    'DEFAULT_RENDERER_CLASSES': ['rest_framework.renderers.JSONRenderer'],
+    'DEFAULT_RENDERER_CLASSES': ['core.renderers.BSONJSONRenderer'],
     'UNAUTHENTICATED_USER': None,
     'UNAUTHENTICATED_TOKEN': None,
 }
 
+# JSON logs written off the request thread (see core/structured_logging.py)
+LOG_LEVEL = config('LOG_LEVEL', default='INFO')
+# Fraction of sub-WARNING records kept per logger, e.g. "scraper=0.1,core.middleware=0.5"
+LOG_SAMPLE_RATES = config('LOG_SAMPLE_RATES', default='')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'filters': {
+        'sampling': {
+            '()': 'core.structured_logging.SamplingFilter',
+            'rates': LOG_SAMPLE_RATES,
+        },
+    },
+    'handlers': {
+        'json': {
+            'class': 'core.structured_logging.BackgroundJSONHandler',
+            'filters': ['sampling'],
+        },
+    },
+    'root': {
+        'handlers': ['json'],
+        'level': LOG_LEVEL,
+    },
+    'loggers': {
+        # Django's own loggers propagate to root instead of using their default console handler
+        'django': {'handlers': [], 'level': LOG_LEVEL, 'propagate': True},
+    },
+}
+
 LANGUAGE_CODE = 'en-us'
 
 TIME_ZONE = 'Asia/Kolkata'
@@ -3,15 +3,75 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
-import time
+from decouple import config
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from html.parser import HTMLParser
+import atexit
+import logging
+import queue
+import re
+import threading
 import json
 from datetime import datetime
 
+from core.metrics import SCRAPER_PHASE_SECONDS
+
+logger = logging.getLogger('scraper')
+
+try:
+    import psutil
+except ImportError:  # RSS-based recycling is skipped without psutil
+    psutil = None
+
 # ============================================================================
 # SETUP AND CONFIGURATION
 # ============================================================================
 
+# Driver pool tuning
+SCRAPER_POOL_SIZE = config('SCRAPER_POOL_SIZE', default=4, cast=int)
+SCRAPER_DRIVER_MAX_USES = config('SCRAPER_DRIVER_MAX_USES', default=50, cast=int)
+SCRAPER_DRIVER_MAX_RSS_MB = config('SCRAPER_DRIVER_MAX_RSS_MB', default=1024, cast=int)
+SCRAPER_POOL_ACQUIRE_TIMEOUT = config('SCRAPER_POOL_ACQUIRE_TIMEOUT', default=60, cast=int)
+
+# Drivers one venue scrape may use at once (spare ones only, never waited for); 0 courts cap = all courts
+SCRAPER_COURT_CONCURRENCY = config('SCRAPER_COURT_CONCURRENCY', default=4, cast=int)
+SCRAPER_MAX_COURTS = config('SCRAPER_MAX_COURTS', default=0, cast=int)
+SCRAPER_PARALLEL_COURTS = config('SCRAPER_PARALLEL_COURTS', default=True, cast=bool)
+
+# How extract_slots reads the table: 'script' (one execute_script), 'page_source'
+# (parse the HTML in Python) or 'per_cell' (one WebDriver call per element)
+SCRAPER_EXTRACT_MODE = config('SCRAPER_EXTRACT_MODE', default='script')
+
+# 'eager' returns from driver.get once the DOM is parsed instead of waiting for every asset
+SCRAPER_PAGE_LOAD_STRATEGY = config('SCRAPER_PAGE_LOAD_STRATEGY', default='eager')
+
+# Per-step upper bounds in seconds; each step finishes as soon as its condition holds
+SCRAPER_TIMEOUTS = {
+    'page_load': config('SCRAPER_PAGE_LOAD_TIMEOUT', default=30, cast=int),
+    'activity': config('SCRAPER_ACTIVITY_TIMEOUT', default=10, cast=int),
+    'courts': config('SCRAPER_COURTS_TIMEOUT', default=10, cast=int),
+    'court_view': config('SCRAPER_COURT_VIEW_TIMEOUT', default=10, cast=int),
+    'table': config('SCRAPER_TABLE_TIMEOUT', default=10, cast=int),
+}
+
+_chromedriver_path = config('CHROMEDRIVER_PATH', default='')
+_chromedriver_lock = threading.Lock()
+
+
+def resolve_chromedriver():
+    """Resolve the chromedriver binary once per process instead of on every scrape"""
+    global _chromedriver_path
+    if not _chromedriver_path:
+        with _chromedriver_lock:
+            if not _chromedriver_path:
+                _chromedriver_path = ChromeDriverManager().install()
+                logger.info("Using chromedriver at %s", _chromedriver_path)
+    return _chromedriver_path
+
+
 def setup_driver():
     """Initialize Chrome WebDriver with headless mode - no browser window opens"""
     options = webdriver.ChromeOptions()
@@ -28,111 +88,339 @@ def setup_driver():
     options.add_argument('--disable-plugins')
     options.add_argument('--window-size=1920,1080')
     options.add_argument('--disable-images')  # Don't load images for faster scraping
+    options.page_load_strategy = SCRAPER_PAGE_LOAD_STRATEGY
     
-    print("🔧 Running Chrome in headless mode (no browser window)")
+    logger.debug("Starting headless Chrome")
     
-    return webdriver.Chrome(
-        service=Service(ChromeDriverManager().install()),
-        options=options
-    )
+    with SCRAPER_PHASE_SECONDS.time(phase='driver_start'):
+        driver = webdriver.Chrome(
+            service=Service(resolve_chromedriver()),
+            options=options
+        )
+    driver.set_page_load_timeout(SCRAPER_TIMEOUTS['page_load'])
+    return driver
 
 # ============================================================================
-# ENHANCED SLOT EXTRACTION ENGINE
+# DRIVER POOL
 # ============================================================================
 
-def extract_slots(driver, venue_name, court_name):
-    """Extract all slot data from the booking table with enhanced availability detection"""
-    wait = WebDriverWait(driver, 10)
-    slots_data = []
-    
-    try:
-        print(f"🔍 Extracting slots for: {court_name}")
-        print("-" * 50)
-        time.sleep(2)
-        
-        slots_table = driver.find_element(By.CLASS_NAME, "style_table__gYUfm")
-        
-        # Extract available dates from table headers
-        date_elements = slots_table.find_elements(By.CLASS_NAME, "style_date__vVFsu")
-        dates = [
-            elem.text.strip()
-            for elem in date_elements
-            if elem.text.strip().isdigit() and len(elem.text.strip()) <= 2
-        ]
-        
-        print(f"📅 Available dates: {dates}")
-        
-        # Get all data rows (excluding header)
-        all_rows = slots_table.find_elements(By.XPATH, ".//tr")
-        data_rows = all_rows[1:]  # Skip header row
-        
-        print(f"⏰ Processing {len(data_rows)} time slots...")
-        
-        # Process each time slot row
-        for row_index, row in enumerate(data_rows):
+class DriverPoolExhausted(Exception):
+    """Raised when no browser frees up within the acquire timeout"""
+
+
+class DriverPool:
+    """Keeps warm headless Chrome instances and lends them out one scrape at a time"""
+
+    def __init__(self, size=SCRAPER_POOL_SIZE, max_uses=SCRAPER_DRIVER_MAX_USES,
+                 max_rss_mb=SCRAPER_DRIVER_MAX_RSS_MB):
+        self.size = size
+        self.max_uses = max_uses
+        self.max_rss_mb = max_rss_mb
+        self._idle = queue.LifoQueue()  # most recently used driver is the warmest
+        self._slots = threading.BoundedSemaphore(size)
+        self._uses = {}
+        self._lock = threading.Lock()
+
+        # Resolve chromedriver now instead of on the first scrape; off the main thread so a
+        # download never delays startup, and a missing driver is reported here, not mid-request
+        threading.Thread(target=self._resolve_driver, name='chromedriver-resolve', daemon=True).start()
+        # Warm browsers would otherwise outlive the server process
+        atexit.register(self.close)
+
+    def _resolve_driver(self):
+        try:
+            resolve_chromedriver()
+        except Exception as e:
+            logger.error("Could not resolve chromedriver, scrapes will fail until it is available: %s", e)
+
+    @contextmanager
+    def borrow(self, timeout=SCRAPER_POOL_ACQUIRE_TIMEOUT):
+        """Lend a driver for the duration of the with-block"""
+        if not self._slots.acquire(timeout=timeout):
+            raise DriverPoolExhausted(f"No browser available after {timeout}s")
+
+        driver = None
+        try:
             try:
-                cells = row.find_elements(By.TAG_NAME, "td")
-                if len(cells) == 0:
-                    continue
-                
-                # Extract time from first cell
-                time_slot = cells[0].text.strip()
-                
-                # Skip invalid time slots
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                driver = setup_driver()
+                with self._lock:
+                    self._uses[id(driver)] = 0
+
+            yield driver
+        finally:
+            if driver is not None:
+                self._release(driver)
+            self._slots.release()
+
+    def _release(self, driver):
+        with self._lock:
+            uses = self._uses.get(id(driver), 0) + 1
+            self._uses[id(driver)] = uses
+
+        if uses >= self.max_uses:
+            logger.info("Recycling driver after %d uses", uses)
+            self._discard(driver)
+            return
+
+        rss_mb = self._rss_mb(driver)
+        if rss_mb is not None and rss_mb > self.max_rss_mb:
+            logger.info("Recycling driver using %.0f MB", rss_mb)
+            self._discard(driver)
+            return
+
+        try:
+            with SCRAPER_PHASE_SECONDS.time(phase='reset'):
+                self._reset(driver)
+        except Exception as e:
+            logger.warning("Driver reset failed, discarding: %s", e)
+            self._discard(driver)
+            return
+
+        self._idle.put(driver)
+
+    def _reset(self, driver):
+        """Leave the browser as a fresh session would find it"""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        try:
+            driver.execute_script('window.localStorage.clear(); window.sessionStorage.clear();')
+        except WebDriverException:
+            pass  # pages like about:blank have no storage to clear
+        driver.delete_all_cookies()
+        driver.get('about:blank')
+
+    def _rss_mb(self, driver):
+        """Resident memory of chromedriver plus its Chrome children"""
+        if psutil is None:
+            return None
+        try:
+            root = psutil.Process(driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+            return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+        except Exception:
+            return None
+
+    def _discard(self, driver):
+        with self._lock:
+            self._uses.pop(id(driver), None)
+        try:
+            with SCRAPER_PHASE_SECONDS.time(phase='teardown'):
+                driver.quit()
+        except Exception as e:
+            logger.warning("Error quitting driver: %s", e)
+
+    def close(self):
+        """Quit every idle driver"""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+
+
+driver_pool = DriverPool()
+
+# ============================================================================
+# READINESS WAITS
+# ============================================================================
+
+SLOT_TABLE_CLASS = "style_table__gYUfm"
+SLOT_DATE_CLASS = "style_date__vVFsu"
+
+ACTIVITY_BUTTON = (By.XPATH, "//button[contains(@class, 'style_btnBook__vzqXl') and normalize-space(text())='Book']")
+COURT_BUTTONS = (By.XPATH, "//button[contains(@class, 'style_btnBook__M3MFK') and normalize-space(text())='Book']")
+
+COUNT_SLOT_ROWS_JS = """
+const table = document.getElementsByClassName(arguments[0])[0];
+return table ? table.querySelectorAll('tr').length : 0;
+"""
+
+
+def wait_for(driver, step, condition):
+    """Wait until `condition` holds, bounded by the timeout configured for `step`"""
+    return WebDriverWait(driver, SCRAPER_TIMEOUTS[step], poll_frequency=0.1).until(condition)
+
+
+def slot_table_has_rows(driver):
+    """Condition: the booking table is rendered with at least one row under its header"""
+    return driver.execute_script(COUNT_SLOT_ROWS_JS, SLOT_TABLE_CLASS) > 1
+
+
+def wait_for_navigation(driver, clicked_element, url_before, step):
+    """Wait until a click has taken effect - the URL moved, the clicked node left the DOM
+    or the slot table showed up"""
+    return wait_for(driver, step, EC.any_of(
+        EC.url_changes(url_before),
+        EC.staleness_of(clicked_element),
+        slot_table_has_rows,
+    ))
+
+# ============================================================================
+# ENHANCED SLOT EXTRACTION ENGINE
+# ============================================================================
+
+# Reads the whole booking table in one WebDriver round trip
+READ_SLOT_TABLE_JS = """
+const table = document.getElementsByClassName(arguments[0])[0];
+if (!table) { return null; }
+const dates = Array.from(table.getElementsByClassName(arguments[1])).map(el => el.innerText);
+const rows = Array.from(table.querySelectorAll('tr')).slice(1).map(row =>
+    Array.from(row.querySelectorAll('td')).map(cell => ({
+        text: cell.innerText,
+        classes: cell.getAttribute('class') || '',
+        style: cell.getAttribute('style') || ''
+    }))
+);
+return {dates: dates, rows: rows};
+"""
+
+
+def read_slot_table(driver):
+    """Snapshot the slot table as plain data: {'dates': [...], 'rows': [[cell, ...], ...]}"""
+    table = driver.execute_script(READ_SLOT_TABLE_JS, SLOT_TABLE_CLASS, SLOT_DATE_CLASS)
+    if table is None:
+        raise ValueError(f"Slot table '{SLOT_TABLE_CLASS}' not found")
+    return table
+
+
+def read_slot_table_per_cell(driver):
+    """Same snapshot as read_slot_table, built with one WebDriver call per element
+
+    This is the original extraction path, kept for benchmarking against the bulk read.
+    """
+    slots_table = driver.find_element(By.CLASS_NAME, SLOT_TABLE_CLASS)
+    date_elements = slots_table.find_elements(By.CLASS_NAME, SLOT_DATE_CLASS)
+    dates = [elem.text for elem in date_elements]
+    valid_dates = [d for d in dates if d.strip().isdigit() and len(d.strip()) <= 2]
+
+    rows = []
+    for row in slots_table.find_elements(By.XPATH, ".//tr")[1:]:
+        cells = row.find_elements(By.TAG_NAME, "td")
+        row_data = []
+        for cell_index, cell in enumerate(cells):
+            # Only the time column and cells under a known date were ever read
+            if cell_index > len(valid_dates):
+                break
+            if cell_index == 0:
+                row_data.append({'text': cell.text, 'classes': "", 'style': ""})
+                time_slot = row_data[0]['text'].strip()
                 if not time_slot or ("AM" not in time_slot and "PM" not in time_slot):
-                    continue
-                
-                # Process each date column
-                data_cells = cells[1:]  # Skip time column
-                for cell_index, cell in enumerate(data_cells):
-                    if cell_index < len(dates):
-                        cell_text = cell.text.strip()
-                        
-                        # Get cell styling/classes for availability detection
-                        cell_classes = cell.get_attribute('class') or ""
-                        cell_style = cell.get_attribute('style') or ""
-                        
-                        # Skip completely empty cells
-                        if not cell_text or cell_text == "-":
-                            continue
-                        
-                        # Enhanced availability detection
-                        price, availability, is_available = parse_slot_data_enhanced(
-                            cell_text, cell_classes, cell_style
-                        )
-                        
-                        # Only add slots with meaningful data
-                        if price or availability:
-                            slot_info = {
-                                'venue': venue_name,
-                                'court': court_name,
-                                'date': dates[cell_index],
-                                'time': time_slot,
-                                'price': price,
-                                'availability': availability,
-                                'is_available': is_available,
-                                'raw_data': cell_text,
-                                'cell_classes': cell_classes,
-                                'scraped_at': datetime.now().isoformat()
-                            }
-                            slots_data.append(slot_info)
-                            
-            except Exception as e:
-                print(f"⚠️ Error processing row {row_index}: {e}")
+                    break
                 continue
-        
+            row_data.append({
+                'text': cell.text,
+                'classes': cell.get_attribute('class') or "",
+                'style': cell.get_attribute('style') or "",
+            })
+        rows.append(row_data)
+
+    return {'dates': dates, 'rows': rows}
+
+
+def build_slots(table, venue_name, court_name):
+    """Turn a slot table snapshot into slot dicts - pure Python, no browser calls"""
+    slots_data = []
+
+    dates = [
+        text.strip()
+        for text in table['dates']
+        if text.strip().isdigit() and len(text.strip()) <= 2
+    ]
+
+    logger.debug("Available dates: %s; processing %d time slots", dates, len(table['rows']))
+
+    scraped_at = datetime.now().isoformat()
+
+    # Process each time slot row
+    for row_index, cells in enumerate(table['rows']):
+        try:
+            if len(cells) == 0:
+                continue
+
+            # Extract time from first cell
+            time_slot = cells[0]['text'].strip()
+
+            # Skip invalid time slots
+            if not time_slot or ("AM" not in time_slot and "PM" not in time_slot):
+                continue
+
+            # Process each date column
+            data_cells = cells[1:]  # Skip time column
+            for cell_index, cell in enumerate(data_cells):
+                if cell_index < len(dates):
+                    cell_text = cell['text'].strip()
+                    cell_classes = cell['classes']
+                    cell_style = cell['style']
+
+                    # Skip completely empty cells
+                    if not cell_text or cell_text == "-":
+                        continue
+
+                    # Enhanced availability detection
+                    price, availability, is_available = parse_slot_data_enhanced(
+                        cell_text, cell_classes, cell_style
+                    )
+
+                    # Only add slots with meaningful data
+                    if price or availability:
+                        slot_info = {
+                            'venue': venue_name,
+                            'court': court_name,
+                            'date': dates[cell_index],
+                            'time': time_slot,
+                            'price': price,
+                            'availability': availability,
+                            'is_available': is_available,
+                            'raw_data': cell_text,
+                            'cell_classes': cell_classes,
+                            'scraped_at': scraped_at
+                        }
+                        slots_data.append(slot_info)
+
+        except Exception as e:
+            logger.warning("Error processing row %d: %s", row_index, e)
+            continue
+
+    return slots_data
+
+
+def extract_slots(driver, venue_name, court_name, mode=SCRAPER_EXTRACT_MODE):
+    """Extract all slot data from the booking table with enhanced availability detection
+
+    `mode` picks how the table is read - see SCRAPER_EXTRACT_MODE.
+    """
+    try:
+        logger.debug("Extracting slots for %s", court_name)
+        wait_for(driver, 'table', slot_table_has_rows)
+
+        if mode == 'page_source':
+            table = read_slot_table_from_html(driver.page_source)
+        elif mode == 'per_cell':
+            table = read_slot_table_per_cell(driver)
+        else:
+            table = read_slot_table(driver)
+        slots_data = build_slots(table, venue_name, court_name)
+
         # Calculate summary statistics
         available_count = sum(1 for slot in slots_data if slot['is_available'])
         unavailable_count = len(slots_data) - available_count
-        
-        print(f"✅ Successfully extracted {len(slots_data)} total slots")
-        print(f"📊 Available: {available_count} | Unavailable: {unavailable_count}")
-        print("-" * 50)
-        
+
+        logger.info("Extracted %d slots for %s", len(slots_data), court_name, extra={
+            'court': court_name,
+            'available_slots': available_count,
+            'unavailable_slots': unavailable_count,
+        })
+
         return slots_data
-        
+
     except Exception as e:
-        print(f"❌ Error extracting slots: {e}")
+        logger.warning("Error extracting slots for %s: %s", court_name, e)
         return []
 
 def parse_slot_data_enhanced(cell_text, cell_classes, cell_style):
@@ -198,103 +486,354 @@ def parse_slot_data_enhanced(cell_text, cell_classes, cell_style):
     
     return price, availability, is_available
 
+# ============================================================================
+# OFFLINE HTML PARSER
+# ============================================================================
+
+# Elements whose boundaries become line breaks in innerText
+_BLOCK_TAGS = {'div', 'p', 'li', 'ul', 'ol', 'section', 'article', 'header', 'footer', 'h1',
+               'h2', 'h3', 'h4', 'h5', 'h6', 'tr', 'table'}
+_VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+              'source', 'track', 'wbr'}
+_SKIPPED_TAGS = {'script', 'style', 'template'}
+# HTML whitespace only; browsers keep &nbsp; (U+00A0) in innerText
+_WHITESPACE = re.compile(r'[ \t\n\r\f]+')
+
+
+def _inner_text(parts):
+    """Approximate the browser's innerText: collapse whitespace, keep line breaks
+
+    Source newlines arrive here already collapsed to spaces by handle_data, so
+    the only line breaks are the ones <br> and block-level tags put in.
+    """
+    lines = (_WHITESPACE.sub(" ", line).strip(" ") for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+class SlotTableHTMLParser(HTMLParser):
+    """Streams page HTML and collects the first slot table the way read_slot_table does"""
+
+    def __init__(self, table_class=SLOT_TABLE_CLASS, date_class=SLOT_DATE_CLASS):
+        super().__init__(convert_charrefs=True)
+        self.table_class = table_class
+        self.date_class = date_class
+        self.found = False
+        self.done = False
+        self.dates = []
+        self.rows = []
+        self._stack = []        # open tags inside the table
+        self._cell = None       # cell being read: {'parts', 'classes', 'style', 'depth'}
+        self._date = None       # date header being read: {'parts', 'depth'}
+        self._skip_depth = None
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        attrs = dict(attrs)
+        classes = attrs.get('class') or ''
+
+        if not self.found:
+            if self.table_class in classes.split():
+                self.found = True
+                self._stack.append(tag)
+            return
+
+        if tag in _VOID_TAGS:
+            if tag == 'br':
+                self._text("\n")
+            return
+
+        self._stack.append(tag)
+        depth = len(self._stack)
+
+        if tag in _SKIPPED_TAGS and self._skip_depth is None:
+            self._skip_depth = depth
+        if tag in _BLOCK_TAGS:
+            self._text("\n")
+
+        if tag == 'tr':
+            self._close_cell()
+            self.rows.append([])
+        elif tag == 'td' and self.rows and self._cell is None:
+            self._cell = {'parts': [], 'classes': classes, 'style': attrs.get('style') or '', 'depth': depth}
+
+        if self.date_class in classes.split() and self._date is None:
+            self._date = {'parts': [], 'depth': depth}
+
+    def handle_endtag(self, tag):
+        if self.done or not self.found or tag in _VOID_TAGS or tag not in self._stack:
+            return
+
+        # Pop back to the matching open tag, closing anything left unclosed
+        while self._stack:
+            depth = len(self._stack)
+            open_tag = self._stack.pop()
+            if open_tag in _BLOCK_TAGS:
+                self._text("\n")
+            if self._skip_depth == depth:
+                self._skip_depth = None
+            if self._date is not None and self._date['depth'] == depth:
+                self.dates.append(_inner_text(self._date['parts']))
+                self._date = None
+            if self._cell is not None and self._cell['depth'] == depth:
+                self._close_cell()
+            if open_tag == tag:
+                break
+
+        if not self._stack:
+            self.done = True
+
+    def handle_data(self, data):
+        if self.found and not self.done and self._skip_depth is None:
+            # Newlines in pretty-printed source render as spaces, like any other whitespace run
+            self._text(_WHITESPACE.sub(' ', data))
+
+    def _text(self, text):
+        if self._cell is not None:
+            self._cell['parts'].append(text)
+        if self._date is not None:
+            self._date['parts'].append(text)
+
+    def _close_cell(self):
+        if self._cell is None:
+            return
+        self.rows[-1].append({
+            'text': _inner_text(self._cell['parts']),
+            'classes': self._cell['classes'],
+            'style': self._cell['style'],
+        })
+        self._cell = None
+
+
+def read_slot_table_from_html(html):
+    """Same snapshot as read_slot_table, parsed from page HTML without a browser"""
+    parser = SlotTableHTMLParser()
+    parser.feed(html)
+    parser.close()
+    if not parser.found:
+        raise ValueError(f"Slot table '{SLOT_TABLE_CLASS}' not found")
+    return {'dates': parser.dates, 'rows': parser.rows[1:]}  # Skip header row
+
+
+def parse_slot_page(html, venue_name, court_name):
+    """Slot dicts for one court straight from a saved booking-page HTML snapshot"""
+    return build_slots(read_slot_table_from_html(html), venue_name, court_name)
+
 # ============================================================================
 # MAIN SCRAPING FUNCTION FOR API
 # ============================================================================
 
-def scrape_venue_slots(venue_url, venue_name):
-    """Scrape slots for all courts in a venue - headless mode"""
-    print(f"🚀 Starting headless scraper for: {venue_name}")
+def open_court_selection(driver, venue_url):
+    """Load the venue page, pick the activity and return the court 'Book' buttons"""
+    with SCRAPER_PHASE_SECONDS.time(phase='navigate'):
+        driver.get(venue_url)
+
+    with SCRAPER_PHASE_SECONDS.time(phase='activity_click'):
+        # Click main activity button
+        activity_button = wait_for(driver, 'activity', EC.element_to_be_clickable(ACTIVITY_BUTTON))
+        activity_button.click()
+
+        # Find available courts
+        return wait_for(driver, 'courts', EC.presence_of_all_elements_located(COURT_BUTTONS))
+
+
+def get_court_name(court_button, index):
+    try:
+        court_container = court_button.find_element(By.XPATH, "./ancestor::div[contains(@class, 'court-card')]")
+        return court_container.find_element(By.TAG_NAME, "h3").text.strip()
+    except:
+        return f"Court {index+1}"
+
+
+def scrape_court(driver, venue_name, court_button, court_name):
+    """Open one court from the court selection view and extract its slots"""
+    logger.debug("Processing court %s", court_name)
+    with SCRAPER_PHASE_SECONDS.time(phase='court_extract'):
+        url_before = driver.current_url
+        court_button.click()
+        wait_for_navigation(driver, court_button, url_before, 'court_view')
+
+        # Extract slot data for this court
+        slots = extract_slots(driver, venue_name, court_name)
+
+    return {
+        'court_name': court_name,
+        'total_slots': len(slots),
+        'available_slots': sum(1 for slot in slots if slot['is_available']),
+        'slots': slots,
+        'scraped_at': datetime.now().isoformat()
+    }
+
+
+def _court_limit(found, max_courts):
+    return min(found, max_courts) if max_courts > 0 else found
+
+
+def _court_failure(index, court_name, e):
+    logger.warning("Error processing court %d: %s", index + 1, e)
+    return {'court_index': index, 'court_name': court_name, 'error': str(e)}
+
+
+def _venue_result(venue_url, venue_name, all_courts_data, failed_courts=()):
+    """Courts that could not be scraped are listed under failed_courts and make the result 'partial'"""
+    logger.info("Scraped %d courts of %s (%d failed)", len(all_courts_data), venue_name, len(failed_courts))
+
+    return {
+        'venue_name': venue_name,
+        'venue_url': venue_url,
+        'total_courts': len(all_courts_data),
+        'courts': all_courts_data,
+        'failed_courts': list(failed_courts),
+        'scraped_at': datetime.now().isoformat(),
+        'status': 'partial' if failed_courts else 'success'
+    }
+
+
+def _venue_error(venue_url, venue_name, e):
+    logger.error("Error scraping %s: %s", venue_name, e)
+    return {
+        'status': 'error',
+        'error': str(e),
+        'venue_name': venue_name,
+        'venue_url': venue_url
+    }
+
+
+def scrape_venue_slots(venue_url, venue_name, driver=None, max_courts=SCRAPER_MAX_COURTS):
+    """Scrape slots for all courts in a venue, one court after another - headless mode
+
+    Pass a borrowed `driver` to reuse a pooled browser; otherwise a private
+    one is started and quit when the scrape finishes. `max_courts` of 0 means
+    every court the venue lists.
+    """
+    logger.info("Starting scrape of %s", venue_name)
     
-    driver = setup_driver()
-    wait = WebDriverWait(driver, 10)
+    owns_driver = driver is None
+    if owns_driver:
+        driver = setup_driver()
     all_courts_data = []
+    failed_courts = []
     
     try:
-        print(f"🌐 Navigating to venue: {venue_name}")
-        driver.get(venue_url)
-        time.sleep(2)
-        
-        # Step 1: Click main activity button
-        print("🎯 Looking for main activity button...")
-        activity_button = wait.until(
-            EC.element_to_be_clickable(
-                (By.XPATH, "//button[contains(@class, 'style_btnBook__vzqXl') and normalize-space(text())='Book']")
-            )
-        )
-        activity_button.click()
-        time.sleep(2)
-        print("✅ Activity button clicked")
+        court_buttons = open_court_selection(driver, venue_url)
+        logger.info("Found %d courts at %s", len(court_buttons), venue_name)
         
-        # Step 2: Find available courts
-        print("🏟️ Searching for available courts...")
-        court_buttons = wait.until(EC.presence_of_all_elements_located(
-            (By.XPATH, "//button[contains(@class, 'style_btnBook__M3MFK') and normalize-space(text())='Book']")
-        ))
-        
-        print(f"✅ Found {len(court_buttons)} available courts")
-        
-        # Step 3: Process each court (limit to first 3 for performance)
-        for i, court_button in enumerate(court_buttons[:3]):
+        for i in range(_court_limit(len(court_buttons), max_courts)):
+            court_name = None
             try:
-                # Extract court name
-                try:
-                    court_container = court_button.find_element(By.XPATH, "./ancestor::div[contains(@class, 'court-card')]")
-                    court_name = court_container.find_element(By.TAG_NAME, "h3").text.strip()
-                except:
-                    court_name = f"Court {i+1}"
-                
-                print(f"🏆 Processing court: {court_name}")
-                court_button.click()
-                time.sleep(3)
-                
-                # Extract slot data for this court
-                slots = extract_slots(driver, venue_name, court_name)
-                
-                court_data = {
-                    'court_name': court_name,
-                    'total_slots': len(slots),
-                    'available_slots': sum(1 for slot in slots if slot['is_available']),
-                    'slots': slots,
-                    'scraped_at': datetime.now().isoformat()
-                }
-                
-                all_courts_data.append(court_data)
+                # Buttons from before the last back() are stale; look them up again
+                court_buttons = wait_for(driver, 'courts', EC.presence_of_all_elements_located(COURT_BUTTONS))
+                court_button = court_buttons[i]
+                court_name = get_court_name(court_button, i)
+
+                all_courts_data.append(scrape_court(driver, venue_name, court_button, court_name))
                 
-                # Go back to court selection
+                # Go back to court selection; the next iteration waits for its buttons
                 driver.back()
-                time.sleep(2)
                 
             except Exception as e:
-                print(f"❌ Error processing court {i+1}: {e}")
+                failed_courts.append(_court_failure(i, court_name, e))
                 continue
         
-        # Final result
-        result = {
-            'venue_name': venue_name,
-            'venue_url': venue_url,
-            'total_courts': len(all_courts_data),
-            'courts': all_courts_data,
-            'scraped_at': datetime.now().isoformat(),
-            'status': 'success'
-        }
-        
-        print(f"🎉 Headless scraping completed successfully!")
-        print(f"📊 Processed {len(all_courts_data)} courts")
-        
-        return result
+        return _venue_result(venue_url, venue_name, all_courts_data, failed_courts)
         
     except Exception as e:
-        print(f"❌ Error scraping venue: {e}")
-        return {
-            'status': 'error',
-            'error': str(e),
-            'venue_name': venue_name,
-            'venue_url': venue_url
-        }
+        return _venue_error(venue_url, venue_name, e)
     finally:
-        driver.quit()
-        print("🏁 Browser closed - Headless scraping finished!")
+        if owns_driver:
+            with SCRAPER_PHASE_SECONDS.time(phase='teardown'):
+                driver.quit()
+            logger.debug("Browser closed")
+
+
+def _drain_courts(driver, venue_url, venue_name, pending, court_names, results, failures):
+    """Scrape courts taken from `pending` one after another on `driver`, re-opening the venue for each"""
+    while True:
+        try:
+            index = pending.get_nowait()
+        except queue.Empty:
+            return
+        try:
+            court_buttons = open_court_selection(driver, venue_url)
+            results[index] = scrape_court(driver, venue_name, court_buttons[index], court_names[index])
+        except Exception as e:
+            failures[index] = _court_failure(index, court_names[index], e)
+
+
+def _drain_courts_on_spare_driver(pool, *args):
+    """Worker: help with the remaining courts if the pool has a driver free right now
+
+    Never waits for one - the venue scrape that started us holds a driver, and
+    scrapes waiting on each other while holding drivers could starve the pool.
+    Whatever this worker does not take, the venue's own driver scrapes.
+    """
+    try:
+        with pool.borrow(timeout=0) as driver:
+            _drain_courts(driver, *args)
+    except DriverPoolExhausted:
+        pass
+    except Exception as e:
+        logger.warning("Spare driver failed, leaving its courts to the venue driver: %s", e)
+
+
+def scrape_venue_slots_parallel(venue_url, venue_name, pool=None,
+                                concurrency=SCRAPER_COURT_CONCURRENCY,
+                                max_courts=SCRAPER_MAX_COURTS):
+    """Scrape the courts of a venue concurrently on whatever pooled drivers are free
+
+    One driver discovers the courts and scrapes the first one itself. Up to
+    `concurrency - 1` workers take spare drivers without waiting for them and
+    share the remaining courts with it; with the pool busy, the venue's own
+    driver scrapes every court in turn. The result has the same shape as
+    scrape_venue_slots, including failed_courts for courts that errored.
+    """
+    pool = pool or driver_pool
+    logger.info("Starting parallel scrape of %s", venue_name)
+
+    executor = None
+    try:
+        with pool.borrow() as driver:
+            court_buttons = open_court_selection(driver, venue_url)
+            logger.info("Found %d courts at %s", len(court_buttons), venue_name)
+
+            court_count = _court_limit(len(court_buttons), max_courts)
+            court_names = [get_court_name(button, i) for i, button in enumerate(court_buttons[:court_count])]
+
+            results, failures = {}, {}
+            pending = queue.Queue()
+            for i in range(1, court_count):
+                pending.put(i)
+            drain_args = (venue_url, venue_name, pending, court_names, results, failures)
+
+            # Start the helpers before working on the first court here
+            futures = []
+            helpers = min(concurrency - 1, court_count - 1)
+            if helpers > 0:
+                executor = ThreadPoolExecutor(max_workers=helpers)
+                futures = [executor.submit(_drain_courts_on_spare_driver, pool, *drain_args) for _ in range(helpers)]
+
+            if court_count:
+                try:
+                    results[0] = scrape_court(driver, venue_name, court_buttons[0], court_names[0])
+                except Exception as e:
+                    failures[0] = _court_failure(0, court_names[0], e)
+
+            _drain_courts(driver, *drain_args)
+            for future in futures:
+                future.result()
+
+        # Results keep the venue's court order
+        all_courts_data = [results[i] for i in sorted(results)]
+        failed_courts = [failures[i] for i in sorted(failures)]
+        return _venue_result(venue_url, venue_name, all_courts_data, failed_courts)
+
+    except DriverPoolExhausted:
+        raise
+    except Exception as e:
+        return _venue_error(venue_url, venue_name, e)
+    finally:
+        if executor is not None:
+            executor.shutdown()
 
 # ============================================================================
 # TEST FUNCTION
@@ -304,7 +843,8 @@ if __name__ == "__main__":
     # Test the headless scraper
     TEST_URL = "https://hudle.in/venues/vinayak-sports-arena-thaltej/750492"
     VENUE_NAME = "Hot Shot Pickleball Arena"
-    
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
     print("🚀 Testing headless scraper...")
     result = scrape_venue_slots(TEST_URL, VENUE_NAME)
     print("\n📋 Final Result:")
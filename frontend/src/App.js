@@ -189,7 +189,8 @@ const VenueCard = ({ venue }) => {
     setPostsLoading(true);
     try {
       const token = await getToken({ template: 'backend' });
-      const response = await fetch(`http://127.0.0.1:8000/api/posts/?venue_id=${venue._id}`, {
+      // The card shows at most 4 posts, so only ask for the first page of 4
+      const response = await fetch(`http://127.0.0.1:8000/api/posts/?venue_id=${venue._id}&limit=4`, {
         headers: {
           Authorization: `Bearer ${token}`,
           'Content-Type': 'application/json',
@@ -198,7 +199,7 @@ const VenueCard = ({ venue }) => {
 
       if (response.ok) {
         const data = await response.json();
-        setPosts(data);
+        setPosts(data.posts);
       }
     } catch (err) {
       console.error('Error fetching posts:', err);
@@ -301,7 +302,7 @@ const RealPostCard = ({ post, onInterestToggled }) => {
 
   const currentUserId = user?.id || user?.user_id;
   const isCreator = post.created_by === currentUserId;
-  const isInterested = post.interested_users?.includes(currentUserId);
+  const isInterested = Boolean(post.is_interested);
 
   const [loading, setLoading] = useState(false);
   const [interestedState, setInterestedState] = useState(isInterested);
@@ -407,7 +408,7 @@ const RealPostCard = ({ post, onInterestToggled }) => {
           <div style={styles.interestCounter}>
             <span style={styles.interestIcon}>👥</span>
             <span style={styles.interestText}>
-              {post.interested_users?.length || 0} interested
+              {post.interested_count || 0} interested
             </span>
           </div>
         </div>
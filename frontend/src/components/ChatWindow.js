@@ -1,5 +1,6 @@
 import React, { useState, useEffect, useRef } from 'react';
 import { useAuth, useUser } from '@clerk/clerk-react';
+import useMessageStream from './useMessageStream';
 
 // Modern encryption/decryption functions
 const encryptMessage = (message) => {
@@ -22,6 +23,14 @@ const decryptMessage = (encryptedMessage) => {
   }
 };
 
+const PAGE_SIZE = 50;
+
+const decryptAll = (data) =>
+  data.map(msg => ({
+    ...msg,
+    message: msg.message_encrypted ? decryptMessage(msg.message_encrypted) : msg.message || 'Message not available'
+  }));
+
 const ChatWindow = ({ targetUserId, targetUserName, onClose }) => {
   const { getToken } = useAuth();
   const { user } = useUser();
@@ -29,38 +38,72 @@ const ChatWindow = ({ targetUserId, targetUserName, onClose }) => {
   const [newMessage, setNewMessage] = useState('');
   const [sending, setSending] = useState(false);
   const [loading, setLoading] = useState(true);
+  const [hasOlder, setHasOlder] = useState(false);
+  const [loadingOlder, setLoadingOlder] = useState(false);
   const messagesEndRef = useRef(null);
+  // Timestamp of the newest server message we hold; polls only ask for what came after it
+  const newestTimestampRef = useRef(null);
+  const skipScrollRef = useRef(false);
 
   const currentUserId = user?.id || user?.user_id;
 
+  // Pushed messages are appended directly; the poll cursor only advances on polls,
+  // so anything the stream missed is still picked up by the next poll
+  const streamConnected = useMessageStream((message) => {
+    if (message.sender_id !== targetUserId) return;
+    const [incoming] = decryptAll([message]);
+    setMessages(prev => (prev.some(m => m._id === incoming._id) ? prev : [...prev, incoming]));
+  });
+
   useEffect(() => {
     fetchMessages();
-    const interval = setInterval(fetchMessages, 3000); // Poll every 3 seconds
-    return () => clearInterval(interval);
   }, []);
 
   useEffect(() => {
+    // Poll every 3 seconds, or only as a safety net while the push stream is up
+    const interval = setInterval(fetchMessages, streamConnected ? 30000 : 3000);
+    return () => clearInterval(interval);
+  }, [streamConnected]);
+
+  useEffect(() => {
+    if (skipScrollRef.current) {
+      skipScrollRef.current = false;
+      return;
+    }
     scrollToBottom();
   }, [messages]);
 
   const fetchMessages = async () => {
     try {
       const token = await getToken({ template: 'backend' });
-      const response = await fetch(`http://127.0.0.1:8000/api/messages/${targetUserId}/`, {
+      const since = newestTimestampRef.current;
+      const query = since ? `since=${encodeURIComponent(since)}` : `limit=${PAGE_SIZE}`;
+      const response = await fetch(`http://127.0.0.1:8000/api/messages/${targetUserId}/?${query}`, {
         headers: {
           Authorization: `Bearer ${token}`,
         },
       });
       if (response.ok) {
         const data = await response.json();
-        
-        // Decrypt messages before displaying
-        const decryptedMessages = data.map(msg => ({
-          ...msg,
-          message: msg.message_encrypted ? decryptMessage(msg.message_encrypted) : msg.message || 'Message not available'
-        }));
-        
-        setMessages(decryptedMessages);
+
+        if (!since) {
+          setMessages(decryptAll(data));
+          setHasOlder(data.length === PAGE_SIZE);
+        } else if (data.length > 0) {
+          // Append only new messages; server copies replace our optimistic ones
+          const incoming = decryptAll(data);
+          setMessages(prev => {
+            const known = new Set(prev.map(m => m._id));
+            return [
+              ...prev.filter(m => !m.pending),
+              ...incoming.filter(m => !known.has(m._id)),
+            ];
+          });
+        }
+
+        if (data.length > 0) {
+          newestTimestampRef.current = data[data.length - 1].timestamp;
+        }
       } else {
         console.error('Failed to fetch messages:', response.status);
       }
@@ -71,6 +114,34 @@ const ChatWindow = ({ targetUserId, targetUserName, onClose }) => {
     }
   };
 
+  const fetchOlderMessages = async () => {
+    const oldest = messages.find(m => !m.pending);
+    if (!oldest || loadingOlder) return;
+
+    setLoadingOlder(true);
+    try {
+      const token = await getToken({ template: 'backend' });
+      const query = `before=${encodeURIComponent(oldest.timestamp)}&limit=${PAGE_SIZE}`;
+      const response = await fetch(`http://127.0.0.1:8000/api/messages/${targetUserId}/?${query}`, {
+        headers: {
+          Authorization: `Bearer ${token}`,
+        },
+      });
+      if (response.ok) {
+        const data = await response.json();
+        skipScrollRef.current = true;
+        setMessages(prev => [...decryptAll(data), ...prev]);
+        setHasOlder(data.length === PAGE_SIZE);
+      } else {
+        console.error('Failed to fetch older messages:', response.status);
+      }
+    } catch (error) {
+      console.error('Error fetching older messages:', error);
+    } finally {
+      setLoadingOlder(false);
+    }
+  };
+
   const sendMessage = async (e) => {
     e.preventDefault();
     if (!newMessage.trim() || sending) return;
@@ -102,6 +173,7 @@ const ChatWindow = ({ targetUserId, targetUserName, onClose }) => {
           sender_name: 'You',
           message: messageToSend, // Display original message
           timestamp: new Date().toISOString(),
+          pending: true,
         };
         setMessages(prev => [...prev, tempMessage]);
         
@@ -152,7 +224,17 @@ const ChatWindow = ({ targetUserId, targetUserName, onClose }) => {
               No messages yet. Start the conversation!
             </div>
           ) : (
-            messages.map((message) => (
+            <>
+            {hasOlder && (
+              <button
+                onClick={fetchOlderMessages}
+                disabled={loadingOlder}
+                style={styles.loadOlderButton}
+              >
+                {loadingOlder ? 'Loading...' : 'Load older messages'}
+              </button>
+            )}
+            {messages.map((message) => (
               <div
                 key={message._id}
                 style={{
@@ -175,7 +257,8 @@ const ChatWindow = ({ targetUserId, targetUserName, onClose }) => {
                   </div>
                 </div>
               </div>
-            ))
+            ))}
+            </>
           )}
           <div ref={messagesEndRef} />
         </div>
@@ -276,6 +359,16 @@ const styles = {
     padding: '20px',
     fontStyle: 'italic',
   },
+  loadOlderButton: {
+    alignSelf: 'center',
+    background: 'none',
+    border: '1px solid #ccc',
+    borderRadius: '12px',
+    padding: '4px 12px',
+    fontSize: '12px',
+    color: '#666',
+    cursor: 'pointer',
+  },
   noMessages: {
     textAlign: 'center',
     color: '#666',
@@ -1,6 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import { useAuth, useUser } from '@clerk/clerk-react';
 import ChatWindow from './ChatWindow';
+import useMessageStream from './useMessageStream';
 
 const MyChats = () => {
   const { getToken } = useAuth();
@@ -12,13 +13,19 @@ const MyChats = () => {
 
   const currentUserId = user?.id || user?.user_id;
 
+  // Any pushed message changes the list order and unread counts
+  const streamConnected = useMessageStream(() => fetchConversations());
+
   useEffect(() => {
     fetchConversations();
-    // Poll for new conversations every 10 seconds
-    const interval = setInterval(fetchConversations, 10000);
-    return () => clearInterval(interval);
   }, []);
 
+  useEffect(() => {
+    // Poll for new conversations every 10 seconds, rarely while the push stream is up
+    const interval = setInterval(fetchConversations, streamConnected ? 60000 : 10000);
+    return () => clearInterval(interval);
+  }, [streamConnected]);
+
   const fetchConversations = async () => {
     try {
       const token = await getToken({ template: 'backend' });
@@ -102,6 +109,9 @@ const MyChats = () => {
               </div>
               
               <div style={styles.conversationActions}>
+                {conversation.unread_count > 0 && (
+                  <span style={styles.unreadBadge}>{conversation.unread_count}</span>
+                )}
                 <button style={styles.chatButton}>Chat</button>
               </div>
             </div>
@@ -125,6 +135,18 @@ const MyChats = () => {
 };
 
 const styles = {
+  unreadBadge: {
+    display: 'inline-block',
+    minWidth: '20px',
+    padding: '2px 6px',
+    marginRight: '8px',
+    borderRadius: '10px',
+    backgroundColor: '#dc3545',
+    color: 'white',
+    fontSize: '12px',
+    fontWeight: '600',
+    textAlign: 'center',
+  },
   container: {
     padding: '24px',
     maxWidth: '800px',
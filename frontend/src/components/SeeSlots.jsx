@@ -33,7 +33,7 @@ const SeeSlots = () => {
 
     try {
       const token = await getToken({ template: 'backend' });
-      const response = await fetch('http://127.0.0.1:8000/api/scrape-slots/', {
+      const response = await fetch('http://127.0.0.1:8000/api/scrape-slots/jobs/', {
         method: 'POST',
         headers: {
           'Authorization': `Bearer ${token}`,
@@ -45,12 +45,28 @@ const SeeSlots = () => {
         }),
       });
 
-      const data = await response.json();
+      let job = await response.json();
 
-      if (response.ok && data.status === 'success') {
-        setSlotsData(data);
+      if (!response.ok) {
+        setError(job.error || 'Error scraping slots');
+        return;
+      }
+
+      // Poll until the scrape job finishes (cached results come back already done)
+      while (job.status === 'queued' || job.status === 'running') {
+        await new Promise((resolve) => setTimeout(resolve, 2000));
+        const pollResponse = await fetch(`http://127.0.0.1:8000/api/scrape-slots/jobs/${job.job_id}/`);
+        job = await pollResponse.json();
+        if (!pollResponse.ok) {
+          break;
+        }
+      }
+
+      // 'partial' results list the courts that failed under failed_courts; show what we have
+      if (job.status === 'done' && job.result && ['success', 'partial'].includes(job.result.status)) {
+        setSlotsData(job.result);
       } else {
-        setError(data.error || 'Error scraping slots');
+        setError(job.error || 'Error scraping slots');
       }
     } catch (err) {
       setError('Network error: ' + err.message);
@@ -0,0 +1,61 @@
+import { useEffect, useRef, useState } from 'react';
+import { useAuth } from '@clerk/clerk-react';
+
+const STREAM_URL = 'http://127.0.0.1:8000/api/messages/stream/';
+const RECONNECT_DELAY = 5000;
+
+// Subscribes to the server-sent stream of messages addressed to the signed-in user.
+// Returns whether the stream is connected so callers can slow their polling down.
+const useMessageStream = (onMessage) => {
+  const { getToken } = useAuth();
+  const [connected, setConnected] = useState(false);
+  const handlerRef = useRef(onMessage);
+  handlerRef.current = onMessage;
+
+  useEffect(() => {
+    if (typeof EventSource === 'undefined') return undefined;
+
+    let source = null;
+    let reconnectTimer = null;
+    let cancelled = false;
+    let everOpened = false;
+
+    const open = async () => {
+      // The token goes in the URL because EventSource cannot send headers
+      const token = await getToken({ template: 'backend' });
+      if (cancelled) return;
+
+      source = new EventSource(`${STREAM_URL}?token=${encodeURIComponent(token)}`);
+      source.onopen = () => {
+        everOpened = true;
+        setConnected(true);
+      };
+      source.onerror = () => {
+        setConnected(false);
+        // Never opened: the server has no stream (e.g. answers 204 under WSGI), so stay on polling
+        if (!everOpened) {
+          source.close();
+          return;
+        }
+        // A rejected (e.g. expired) token closes the stream for good; reopen with a fresh one
+        if (source.readyState === EventSource.CLOSED && !cancelled) {
+          reconnectTimer = setTimeout(open, RECONNECT_DELAY);
+        }
+      };
+      source.addEventListener('message', (event) => {
+        handlerRef.current(JSON.parse(event.data).message);
+      });
+    };
+
+    open();
+    return () => {
+      cancelled = true;
+      clearTimeout(reconnectTimer);
+      if (source) source.close();
+    };
+  }, []);
+
+  return connected;
+};
+
+export default useMessageStream;